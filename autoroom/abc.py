@@ -72,12 +72,26 @@ class MixinMeta(ABC):
     ) -> dict[str, Any] | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def clear_autoroom_source_config_cache(self, autoroom_source_id: int) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_autoroom_info(
         self, autoroom: discord.VoiceChannel | None
     ) -> dict[str, Any] | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def clear_autoroom_info_cache(self, autoroom_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_member_denied(
+        self, autoroom_id: int, member_id: int, *, denied: bool
+    ) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_autoroom_legacy_text_channel(
         self, autoroom: discord.VoiceChannel | int | None
@@ -101,3 +115,11 @@ class MixinMeta(ABC):
     @abstractmethod
     async def get_bot_roles(self, guild: discord.Guild) -> list[discord.Role]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_privileged_roles(self, guild: discord.Guild) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_privileged_roles_cache(self, guild_id: int) -> None:
+        raise NotImplementedError
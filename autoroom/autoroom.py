@@ -1,5 +1,7 @@
 """AutoRoom cog for Red-DiscordBot by PhasecoreX."""
 
+import asyncio
+import logging
 import random
 from abc import ABC
 from contextlib import suppress
@@ -16,6 +18,8 @@ from .c_autoroomset import AutoRoomSetCommands, channel_name_template
 from .pcx_lib import Perms, SettingDisplay
 from .pcx_template import Template
 
+log = logging.getLogger("red.pcxcogs.autoroom")
+
 
 class CompositeMetaClass(type(commands.Cog), type(ABC)):
     """Allows the metaclass used for proper type detection to coexist with discord.py's metaclass."""
@@ -65,6 +69,7 @@ class AutoRoom(
         "denied": [],
     }
     extra_channel_name_change_delay = 4
+    legacy_text_perms_delay = 1
 
     perms_bot_source: ClassVar[dict[str, bool]] = {
         "view_channel": True,
@@ -112,6 +117,24 @@ class AutoRoom(
         )
         self.config.register_channel(**self.default_channel_settings)
         self.template = Template()
+        # channel id -> AutoRoom Source config, or None if it isn't an AutoRoom Source
+        self.autoroom_source_configs: dict[int, dict[str, Any] | None] = {}
+        # channel id -> AutoRoom config, or None if it isn't an AutoRoom
+        self.autoroom_infos: dict[int, dict[str, Any] | None] = {}
+        # category id -> (template, channel name with dupenum 1) -> dupenum -> channel name with that dupenum
+        self.channel_name_dupenums: dict[
+            int, dict[tuple[str, str], dict[int, str]]
+        ] = {}
+        # AutoRoom channel id -> task that will update its legacy text channel permissions
+        self.legacy_text_perms_tasks: dict[int, asyncio.Task] = {}
+        # AutoRoom channel ids that need their legacy text channel permissions updated
+        self.legacy_text_perms_pending: set[int] = set()
+        # member id -> AutoRoom channel ids that they have been denied from
+        self.denied_autorooms: dict[int, set[int]] = {}
+        # guild id -> bot/mod/admin roles and access settings
+        self.privileged_roles: dict[int, dict[str, Any]] = {}
+        # AutoRoom Source channel id -> overwrites for new AutoRooms (minus the AutoRoom Owner)
+        self.autoroom_overwrite_plans: dict[int, dict[str, Any]] = {}
         self.bucket_autoroom_create = commands.CooldownMapping.from_cooldown(
             2, 60, lambda member: member
         )
@@ -129,6 +152,12 @@ class AutoRoom(
     # Red methods
     #
 
+    async def cog_unload(self) -> None:
+        """Clean up when cog shuts down."""
+        self.template.close()
+        for task in self.legacy_text_perms_tasks.values():
+            task.cancel()
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
         pre_processed = super().format_help_for_context(ctx)
@@ -145,6 +174,7 @@ class AutoRoom(
     async def initialize(self) -> None:
         """Perform setup actions before loading cog."""
         await self._migrate_config()
+        await self._load_denied_autorooms()
         self.bot.loop.create_task(self._cleanup_autorooms())
 
     async def _migrate_config(self) -> None:
@@ -275,6 +305,14 @@ class AutoRoom(
                     ).clear_raw("text_channel")
             await self.config.schema_version.set(7)
 
+    async def _load_denied_autorooms(self) -> None:
+        """Build the index of which AutoRooms each member has been denied from."""
+        self.denied_autorooms.clear()
+        voice_channel_dict = await self.config.all_channels()
+        for voice_channel_id, voice_channel_settings in voice_channel_dict.items():
+            for member_id in voice_channel_settings["denied"]:
+                self.set_member_denied(voice_channel_id, member_id, denied=True)
+
     async def _cleanup_autorooms(self) -> None:
         """Remove non-existent AutoRooms from the config."""
         await self.bot.wait_until_ready()
@@ -295,6 +333,9 @@ class AutoRoom(
                         reason="AutoRoom: Associated voice channel deleted."
                     )
                 await self.config.channel_from_id(voice_channel_id).clear()
+                self.clear_autoroom_info_cache(voice_channel_id)
+                for member_id in voice_channel_settings["denied"]:
+                    self.set_member_denied(voice_channel_id, member_id, denied=False)
 
     #
     # Listener methods
@@ -305,6 +346,9 @@ class AutoRoom(
         self, guild_channel: discord.abc.GuildChannel
     ) -> None:
         """Clean up config when an AutoRoom (or Source) is deleted (either by the bot or the user)."""
+        if isinstance(guild_channel, discord.CategoryChannel):
+            self.channel_name_dupenums.pop(guild_channel.id, None)
+            return
         if not isinstance(guild_channel, discord.VoiceChannel):
             return
         if await self.get_autoroom_source_config(guild_channel):
@@ -312,8 +356,13 @@ class AutoRoom(
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(guild_channel.guild.id), str(guild_channel.id)
             ).clear()
+            self.clear_autoroom_source_config_cache(guild_channel.id)
         else:
             # AutoRoom was deleted, remove associated text channel if it exists
+            autoroom_info = await self.get_autoroom_info(guild_channel)
+            if autoroom_info:
+                for member_id in autoroom_info["denied"]:
+                    self.set_member_denied(guild_channel.id, member_id, denied=False)
             legacy_text_channel = await self.get_autoroom_legacy_text_channel(
                 guild_channel
             )
@@ -322,6 +371,46 @@ class AutoRoom(
                     reason="AutoRoom: Associated voice channel deleted."
                 )
             await self.config.channel(guild_channel).clear()
+        # Channel IDs are never reused, so also forget that it wasn't an AutoRoom (Source)
+        self.clear_autoroom_source_config_cache(guild_channel.id)
+        self.clear_autoroom_info_cache(guild_channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, _before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        """Forget the overwrite plans that an AutoRoom Source or destination category change affects."""
+        if (
+            isinstance(after, discord.CategoryChannel)
+            or after.id in self.autoroom_overwrite_plans
+        ):
+            self._clear_autoroom_overwrite_plans(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(
+        self, _before: discord.Role, after: discord.Role
+    ) -> None:
+        """Forget the overwrite plans for a guild when a role changes, as the bots permissions may have changed."""
+        self._clear_autoroom_overwrite_plans(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """Forget the cached bot/mod/admin roles when a role is deleted, in case it was one of them."""
+        self.clear_privileged_roles_cache(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(
+        self, before: discord.Member, after: discord.Member
+    ) -> None:
+        """Forget the overwrite plans for a guild when the bots roles change."""
+        if after == after.guild.me and before.roles != after.roles:
+            self._clear_autoroom_overwrite_plans(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context) -> None:
+        """Forget the cached mod/admin roles when they are changed with Red's set roles commands."""
+        if ctx.guild and ctx.command.full_parent_name == "set roles":
+            self.clear_privileged_roles_cache(ctx.guild.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -344,7 +433,7 @@ class AutoRoom(
                 deleted = await self._process_autoroom_delete(leaving.channel, member)
                 if not deleted:
                     # AutoRoom wasn't deleted, so update text channel perms
-                    await self._process_autoroom_legacy_text_perms(leaving.channel)
+                    self._queue_autoroom_legacy_text_perms(leaving.channel)
 
                     if member.id == autoroom_info["owner"]:
                         # There are still users left and the AutoRoom Owner left.
@@ -363,12 +452,15 @@ class AutoRoom(
                 await self._process_autoroom_create(joining.channel, asc, member)
             # If user entered an AutoRoom, allow them into the associated text channel
             elif await self.get_autoroom_info(joining.channel):
-                await self._process_autoroom_legacy_text_perms(joining.channel)
+                self._queue_autoroom_legacy_text_perms(joining.channel)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
         """Check joining users against existing AutoRooms, re-adds their deny override if missing."""
-        for autoroom_channel in member.guild.voice_channels:
+        for autoroom_id in list(self.denied_autorooms.get(member.id, ())):
+            autoroom_channel = member.guild.get_channel(autoroom_id)
+            if not isinstance(autoroom_channel, discord.VoiceChannel):
+                continue
             autoroom_info = await self.get_autoroom_info(autoroom_channel)
             if autoroom_info and member.id in autoroom_info["denied"]:
                 source_channel = member.guild.get_channel(
@@ -431,62 +523,22 @@ class AutoRoom(
                     return
 
         # Generate channel name
-        taken_channel_names = [
-            voice_channel.name for voice_channel in dest_category.voice_channels
-        ]
         new_channel_name = await self._generate_channel_name(
-            autoroom_source_config, member, taken_channel_names
+            autoroom_source_config, member, dest_category
         )
 
         # Generate overwrites
-        perms = Perms()
         dest_perms = dest_category.permissions_for(dest_category.guild.me)
-        source_overwrites = autoroom_source.overwrites or {}
-        member_roles = self.get_member_roles(autoroom_source)
-        for target, permissions in source_overwrites.items():
-            # We can't put manage_roles in overwrites, so just get rid of it
-            permissions.update(manage_roles=None)
-            # Check each permission for each overwrite target to make sure the bot has it allowed in the dest category
-            failed_checks = {}
-            for name, value in permissions:
-                if value is not None:
-                    permission_check_result = getattr(dest_perms, name)
-                    if not permission_check_result:
-                        # If the bot doesn't have the permission allowed in the dest category, just ignore it. Too bad!
-                        failed_checks[name] = None
-            if failed_checks:
-                permissions.update(**failed_checks)
-            perms.overwrite(target, permissions)
-            if member_roles and target in member_roles:
-                # If we have member roles and this target is one, apply AutoRoom type permissions
-                perms.update(target, autoroom_source_config["perms"]["access"])
-
-        # Update overwrites for default role to account for AutoRoom type
-        if member_roles:
-            perms.update(guild.default_role, autoroom_source_config["perms"]["deny"])
-        else:
-            perms.update(guild.default_role, autoroom_source_config["perms"]["access"])
-
-        # Bot overwrites
-        perms.update(guild.me, self.perms_bot_dest)
+        perms = Perms(
+            await self._get_autoroom_overwrite_plan(
+                autoroom_source, autoroom_source_config, dest_category
+            )
+        )
 
         # AutoRoom Owner overwrites
         if autoroom_source_config["room_type"] != "server":
             perms.update(member, autoroom_source_config["perms"]["owner"])
 
-        # Admin/moderator/bot overwrites
-        # Add bot roles to be allowed
-        additional_allowed_roles = await self.get_bot_roles(guild)
-        if await self.config.guild(guild).mod_access():
-            # Add mod roles to be allowed
-            additional_allowed_roles += await self.bot.get_mod_roles(guild)
-        if await self.config.guild(guild).admin_access():
-            # Add admin roles to be allowed
-            additional_allowed_roles += await self.bot.get_admin_roles(guild)
-        for role in additional_allowed_roles:
-            # Add all the mod/admin roles, if required
-            perms.update(role, autoroom_source_config["perms"]["allow"])
-
         # Create new AutoRoom
         voice_channel_config = {
             "name": new_channel_name,
@@ -505,6 +557,7 @@ class AutoRoom(
         )
         if autoroom_source_config["room_type"] != "server":
             await self.config.channel(new_voice_channel).owner.set(member.id)
+        self.clear_autoroom_info_cache(new_voice_channel.id)
         try:
             await member.move_to(
                 new_voice_channel, reason="AutoRoom: Move user to new AutoRoom."
@@ -529,13 +582,14 @@ class AutoRoom(
             else:
                 perms.update(member, self.perms_legacy_text_allow)
             # Admin/moderator overwrites
+            privileged_roles = await self.get_privileged_roles(guild)
             additional_allowed_roles_text = []
-            if await self.config.guild(guild).mod_access():
+            if privileged_roles["mod_access"]:
                 # Add mod roles to be allowed
-                additional_allowed_roles_text += await self.bot.get_mod_roles(guild)
-            if await self.config.guild(guild).admin_access():
+                additional_allowed_roles_text += privileged_roles["mod_roles"]
+            if privileged_roles["admin_access"]:
                 # Add admin roles to be allowed
-                additional_allowed_roles_text += await self.bot.get_admin_roles(guild)
+                additional_allowed_roles_text += privileged_roles["admin_roles"]
             for role in additional_allowed_roles_text:
                 # Add all the mod/admin roles, if required
                 perms.update(role, self.perms_legacy_text_allow)
@@ -555,6 +609,7 @@ class AutoRoom(
             await self.config.channel(new_voice_channel).associated_text_channel.set(
                 new_legacy_text_channel.id
             )
+            self.clear_autoroom_info_cache(new_voice_channel.id)
 
         # Send text chat hint if enabled
         if autoroom_source_config["text_channel_hint"]:
@@ -569,6 +624,83 @@ class AutoRoom(
                     else:
                         await new_voice_channel.send(hint[:2000].strip())
 
+    async def _get_autoroom_overwrite_plan(
+        self,
+        autoroom_source: discord.VoiceChannel,
+        autoroom_source_config: dict[str, Any],
+        dest_category: discord.CategoryChannel,
+    ) -> dict[discord.Role | discord.Member, discord.PermissionOverwrite]:
+        """Get the overwrites for a new AutoRoom made from an AutoRoom Source, minus the AutoRoom Owner overwrites.
+
+        These only change when the AutoRoom Source, destination category, or roles change,
+        so they are cached until then. Don't modify the returned overwrites.
+        """
+        plan = self.autoroom_overwrite_plans.get(autoroom_source.id)
+        if plan and plan["dest_category_id"] == dest_category.id:
+            return plan["overwrites"]
+
+        guild = autoroom_source.guild
+        perms = Perms()
+        dest_perms = dest_category.permissions_for(guild.me)
+        source_overwrites = autoroom_source.overwrites or {}
+        member_roles = self.get_member_roles(autoroom_source)
+        for target, permissions in source_overwrites.items():
+            # We can't put manage_roles in overwrites, so just get rid of it
+            permissions.update(manage_roles=None)
+            # Check each permission for each overwrite target to make sure the bot has it allowed in the dest category
+            failed_checks = {}
+            for name, value in permissions:
+                if value is not None:
+                    permission_check_result = getattr(dest_perms, name)
+                    if not permission_check_result:
+                        # If the bot doesn't have the permission allowed in the dest category, just ignore it. Too bad!
+                        failed_checks[name] = None
+            if failed_checks:
+                permissions.update(**failed_checks)
+            perms.overwrite(target, permissions)
+            if member_roles and target in member_roles:
+                # If we have member roles and this target is one, apply AutoRoom type permissions
+                perms.update(target, autoroom_source_config["perms"]["access"])
+
+        # Update overwrites for default role to account for AutoRoom type
+        if member_roles:
+            perms.update(guild.default_role, autoroom_source_config["perms"]["deny"])
+        else:
+            perms.update(guild.default_role, autoroom_source_config["perms"]["access"])
+
+        # Bot overwrites
+        perms.update(guild.me, self.perms_bot_dest)
+
+        # Admin/moderator/bot overwrites
+        # Add bot roles to be allowed
+        privileged_roles = await self.get_privileged_roles(guild)
+        additional_allowed_roles = [*privileged_roles["bot_roles"]]
+        if privileged_roles["mod_access"]:
+            # Add mod roles to be allowed
+            additional_allowed_roles += privileged_roles["mod_roles"]
+        if privileged_roles["admin_access"]:
+            # Add admin roles to be allowed
+            additional_allowed_roles += privileged_roles["admin_roles"]
+        for role in additional_allowed_roles:
+            # Add all the mod/admin roles, if required
+            perms.update(role, autoroom_source_config["perms"]["allow"])
+
+        overwrites = perms.overwrites or {}
+        self.autoroom_overwrite_plans[autoroom_source.id] = {
+            "guild_id": guild.id,
+            "dest_category_id": dest_category.id,
+            "overwrites": overwrites,
+        }
+        return overwrites
+
+    def _clear_autoroom_overwrite_plans(self, guild_id: int) -> None:
+        """Forget the overwrite plans for every AutoRoom Source in a guild."""
+        self.autoroom_overwrite_plans = {
+            autoroom_source_id: plan
+            for autoroom_source_id, plan in self.autoroom_overwrite_plans.items()
+            if plan["guild_id"] != guild_id
+        }
+
     @staticmethod
     async def _process_autoroom_delete(
         voice_channel: discord.VoiceChannel, leaving_user: discord.Member | None
@@ -589,6 +721,39 @@ class AutoRoom(
                 return True
         return False
 
+    def _queue_autoroom_legacy_text_perms(self, autoroom: discord.VoiceChannel) -> None:
+        """Update the legacy text channel permissions of an AutoRoom shortly, along with any other changes that come in by then."""
+        self.legacy_text_perms_pending.add(autoroom.id)
+        task = self.legacy_text_perms_tasks.get(autoroom.id)
+        if task is None or task.done():
+            self.legacy_text_perms_tasks[autoroom.id] = asyncio.create_task(
+                self._legacy_text_perms_updater(autoroom)
+            )
+
+    async def _legacy_text_perms_updater(self, autoroom: discord.VoiceChannel) -> None:
+        """Update the legacy text channel permissions of an AutoRoom until there are no more pending updates.
+
+        Waiting a bit first means that a burst of members joining and leaving results in a single edit.
+        """
+        try:
+            while autoroom.id in self.legacy_text_perms_pending:
+                await asyncio.sleep(self.legacy_text_perms_delay)
+                self.legacy_text_perms_pending.discard(autoroom.id)
+                try:
+                    with suppress(
+                        discord.NotFound
+                    ):  # The AutoRoom or legacy text channel may have been deleted while we were waiting
+                        await self._process_autoroom_legacy_text_perms(autoroom)
+                except Exception:
+                    # Keep going, in case there are more updates pending for this AutoRoom
+                    log.exception(
+                        "Unable to update the legacy text channel permissions of AutoRoom %d",
+                        autoroom.id,
+                    )
+        finally:
+            self.legacy_text_perms_pending.discard(autoroom.id)
+            del self.legacy_text_perms_tasks[autoroom.id]
+
     async def _process_autoroom_legacy_text_perms(
         self, autoroom: discord.VoiceChannel
     ) -> None:
@@ -621,9 +786,16 @@ class AutoRoom(
         self,
         autoroom_source_config: dict,
         member: discord.Member,
-        taken_channel_names: list,
+        dest_category: discord.CategoryChannel,
     ) -> str:
-        """Return a channel name with an incrementing number appended to it, based on a formatting string."""
+        """Return a channel name with an incrementing number appended to it, based on a formatting string.
+
+        The number (dupenum) is increased until the name isn't taken in the destination category.
+        The names that each dupenum ended up as are remembered (per template), so the ones that are
+        still taken can be skipped without rendering the template for each of them again. These are
+        checked against the channels currently in the category every time, so channels that have been
+        renamed or deleted since are rendered again.
+        """
         template = None
         if autoroom_source_config["channel_name_type"] in channel_name_template:
             template = channel_name_template[
@@ -652,16 +824,44 @@ class AutoRoom(
             )
 
         # Check for duplicate names
-        attempted_channel_names = []
+        taken_channel_names = {
+            voice_channel.name for voice_channel in dest_category.voice_channels
+        }
+        if new_channel_name not in taken_channel_names:
+            return new_channel_name
+        category_dupenums = self.channel_name_dupenums.setdefault(dest_category.id, {})
+        dupenums_key = (template, new_channel_name)
+        used_dupenums = category_dupenums.setdefault(dupenums_key, {})
+        # Forget about AutoRooms that have been deleted or renamed since
+        for dupenum, channel_name in list(used_dupenums.items()):
+            if channel_name not in taken_channel_names:
+                del used_dupenums[dupenum]
+        # The template could use more than just what is in the channel name, so make sure
+        # that it renders the same names for this member before skipping any of them
+        if used_dupenums:
+            check_dupenum = min(used_dupenums)
+            if (
+                await self.format_template_room_name(template, data, check_dupenum)
+                != used_dupenums[check_dupenum]
+            ):
+                used_dupenums.clear()
+        attempted_channel_names = set()
         while (
             new_channel_name in taken_channel_names
             and new_channel_name not in attempted_channel_names
         ):
+            attempted_channel_names.add(new_channel_name)
             attempt += 1
-            attempted_channel_names.append(new_channel_name)
+            while attempt in used_dupenums:
+                attempt += 1
             new_channel_name = await self.format_template_room_name(
                 template, data, attempt
             )
+            if new_channel_name not in attempted_channel_names:
+                used_dupenums[attempt] = new_channel_name
+        if not used_dupenums:
+            # The template doesn't use dupenum
+            del category_dupenums[dupenums_key]
         return new_channel_name
 
     #
@@ -706,9 +906,10 @@ class AutoRoom(
 
         Also takes into account if the setting is enabled.
         """
-        if await self.config.guild(who.guild).admin_access():
+        privileged_roles = await self.get_privileged_roles(who.guild)
+        if privileged_roles["admin_access"]:
             if isinstance(who, discord.Role):
-                return who in await self.bot.get_admin_roles(who.guild)
+                return who in privileged_roles["admin_roles"]
             if isinstance(who, discord.Member):
                 return await self.bot.is_admin(who)
         return False
@@ -718,9 +919,10 @@ class AutoRoom(
 
         Also takes into account if the setting is enabled.
         """
-        if await self.config.guild(who.guild).mod_access():
+        privileged_roles = await self.get_privileged_roles(who.guild)
+        if privileged_roles["mod_access"]:
             if isinstance(who, discord.Role):
-                return who in await self.bot.get_mod_roles(who.guild)
+                return who in privileged_roles["mod_roles"]
             if isinstance(who, discord.Member):
                 return await self.bot.is_mod(who)
         return False
@@ -863,6 +1065,7 @@ class AutoRoom(
                 await self.config.custom(
                     "AUTOROOM_SOURCE", str(guild.id), channel_id
                 ).clear()
+                self.clear_autoroom_source_config_cache(int(channel_id))
         result = {}
         for _, channel_id, config in sorted(
             unsorted_list_of_configs, key=lambda source_config: source_config[0]
@@ -873,15 +1076,22 @@ class AutoRoom(
     async def get_autoroom_source_config(
         self, autoroom_source: discord.VoiceChannel | discord.abc.GuildChannel | None
     ) -> dict[str, Any] | None:
-        """Return the config for an autoroom source, or None if not set up yet."""
+        """Return the config for an autoroom source, or None if not set up yet.
+
+        This is cached, so anything that changes an AutoRoom Source config needs to call
+        clear_autoroom_source_config_cache afterwards.
+        """
         if not autoroom_source:
             return None
         if not isinstance(autoroom_source, discord.VoiceChannel):
             return None
+        if autoroom_source.id in self.autoroom_source_configs:
+            return self.autoroom_source_configs[autoroom_source.id]
         config = await self.config.custom(
             "AUTOROOM_SOURCE", str(autoroom_source.guild.id), str(autoroom_source.id)
         ).all()  # Returns default values
         if not config["dest_category_id"]:
+            self.autoroom_source_configs[autoroom_source.id] = None
             return None
 
         perms = {
@@ -906,17 +1116,57 @@ class AutoRoom(
             perms["access"] = perms["allow"]
 
         config["perms"] = perms
+        self.autoroom_source_configs[autoroom_source.id] = config
         return config
 
+    def clear_autoroom_source_config_cache(self, autoroom_source_id: int) -> None:
+        """Forget the cached config for an AutoRoom Source, so that it is read again next time."""
+        self.autoroom_source_configs.pop(autoroom_source_id, None)
+        self.autoroom_overwrite_plans.pop(autoroom_source_id, None)
+
     async def get_autoroom_info(
         self, autoroom: discord.VoiceChannel | None
     ) -> dict[str, Any] | None:
-        """Get info for an AutoRoom, or None if the voice channel isn't an AutoRoom."""
+        """Get info for an AutoRoom, or None if the voice channel isn't an AutoRoom.
+
+        This is cached, so anything that changes an AutoRoom config needs to call
+        clear_autoroom_info_cache afterwards.
+        """
         if not autoroom:
             return None
-        if not await self.config.channel(autoroom).source_channel():
-            return None
-        return await self.config.channel(autoroom).all()
+        return await self._get_autoroom_info_from_id(autoroom.id)
+
+    async def _get_autoroom_info_from_id(
+        self, autoroom_id: int
+    ) -> dict[str, Any] | None:
+        """Get info for an AutoRoom by its channel ID, or None if it isn't an AutoRoom."""
+        if autoroom_id not in self.autoroom_infos:
+            config = await self.config.channel_from_id(autoroom_id).all()
+            self.autoroom_infos[autoroom_id] = (
+                config if config["source_channel"] else None
+            )
+        return self.autoroom_infos[autoroom_id]
+
+    def clear_autoroom_info_cache(self, autoroom_id: int) -> None:
+        """Forget the cached info for an AutoRoom, so that it is read again next time."""
+        self.autoroom_infos.pop(autoroom_id, None)
+
+    def set_member_denied(
+        self, autoroom_id: int, member_id: int, *, denied: bool
+    ) -> None:
+        """Update the index of which AutoRooms a member has been denied from.
+
+        This needs to be called alongside any change to the denied list of an AutoRoom config.
+        """
+        if denied:
+            self.denied_autorooms.setdefault(member_id, set()).add(autoroom_id)
+            return
+        autoroom_ids = self.denied_autorooms.get(member_id)
+        if autoroom_ids is None:
+            return
+        autoroom_ids.discard(autoroom_id)
+        if not autoroom_ids:
+            del self.denied_autorooms[member_id]
 
     async def get_autoroom_legacy_text_channel(
         self, autoroom: discord.VoiceChannel | int | None
@@ -926,9 +1176,10 @@ class AutoRoom(
             autoroom = autoroom.id
         if not autoroom:
             return None
-        legacy_text_channel_id = await self.config.channel_from_id(
-            autoroom
-        ).associated_text_channel()
+        autoroom_info = await self._get_autoroom_info_from_id(autoroom)
+        legacy_text_channel_id = (
+            autoroom_info["associated_text_channel"] if autoroom_info else None
+        )
         legacy_text_channel = (
             self.bot.get_channel(legacy_text_channel_id)
             if legacy_text_channel_id
@@ -1048,6 +1299,34 @@ class AutoRoom(
 
     async def get_bot_roles(self, guild: discord.Guild) -> list[discord.Role]:
         """Get the additional bot roles that are added to each AutoRoom."""
+        return [*(await self.get_privileged_roles(guild))["bot_roles"]]
+
+    async def get_privileged_roles(self, guild: discord.Guild) -> dict[str, Any]:
+        """Get the bot, mod, and admin roles for a guild, as well as if mods and admins have access to AutoRooms.
+
+        This is cached, so anything that changes these settings needs to call
+        clear_privileged_roles_cache afterwards.
+        """
+        if guild.id not in self.privileged_roles:
+            guild_config = self.config.guild(guild)
+            self.privileged_roles[guild.id] = {
+                "bot_roles": await self._get_bot_roles_from_config(guild),
+                "mod_access": await guild_config.mod_access(),
+                "mod_roles": await self.bot.get_mod_roles(guild),
+                "admin_access": await guild_config.admin_access(),
+                "admin_roles": await self.bot.get_admin_roles(guild),
+            }
+        return self.privileged_roles[guild.id]
+
+    def clear_privileged_roles_cache(self, guild_id: int) -> None:
+        """Forget the cached bot/mod/admin roles for a guild, so that they are read again next time."""
+        self.privileged_roles.pop(guild_id, None)
+        self._clear_autoroom_overwrite_plans(guild_id)
+
+    async def _get_bot_roles_from_config(
+        self, guild: discord.Guild
+    ) -> list[discord.Role]:
+        """Get the bot roles from the config, removing any that no longer exist."""
         bot_roles = []
         bot_role_ids = []
         some_roles_were_not_found = False
@@ -254,6 +254,7 @@ class AutoRoomCommands(MixinMeta, ABC):
                 reason="AutoRoom: Ownership claimed",
             )
         await self.config.channel(autoroom_channel).owner.set(new_owner.id)
+        self.clear_autoroom_info_cache(autoroom_channel.id)
 
         legacy_text_channel = await self.get_autoroom_legacy_text_channel(
             autoroom_channel
@@ -443,6 +444,10 @@ class AutoRoomCommands(MixinMeta, ABC):
                         denied_users.append(target.id)
                     elif access == "allow" and target.id in denied_users:
                         denied_users.remove(target.id)
+                self.clear_autoroom_info_cache(autoroom_channel.id)
+                self.set_member_denied(
+                    autoroom_channel.id, target.id, denied=access == "deny"
+                )
         if perms.modified:
             await autoroom_channel.edit(
                 overwrites=perms.overwrites or {},
@@ -231,6 +231,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             return
         admin_access = not await self.config.guild(ctx.guild).admin_access()
         await self.config.guild(ctx.guild).admin_access.set(admin_access)
+        self.clear_privileged_roles_cache(ctx.guild.id)
         await ctx.send(
             success(
                 f"Admins are {'now' if admin_access else 'no longer'} able to join (new) locked/private AutoRooms."
@@ -244,6 +245,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             return
         mod_access = not await self.config.guild(ctx.guild).mod_access()
         await self.config.guild(ctx.guild).mod_access.set(mod_access)
+        self.clear_privileged_roles_cache(ctx.guild.id)
         await ctx.send(
             success(
                 f"Moderators are {'now' if mod_access else 'no longer'} able to join (new) locked/private AutoRooms."
@@ -266,6 +268,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
         if role.id not in bot_role_ids:
             bot_role_ids.append(role.id)
             await self.config.guild(ctx.guild).bot_access.set(bot_role_ids)
+            self.clear_privileged_roles_cache(ctx.guild.id)
 
         role_list = "\n".join(
             [role.name for role in await self.get_bot_roles(ctx.guild)]
@@ -287,6 +290,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
         if role.id in bot_role_ids:
             bot_role_ids.remove(role.id)
             await self.config.guild(ctx.guild).bot_access.set(bot_role_ids)
+            self.clear_privileged_roles_cache(ctx.guild.id)
 
         if bot_role_ids:
             role_list = "\n".join(
@@ -416,6 +420,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
         await self.config.custom(
             "AUTOROOM_SOURCE", str(ctx.guild.id), str(source_voice_channel.id)
         ).set(new_source)
+        self.clear_autoroom_source_config_cache(source_voice_channel.id)
         await ctx.send(
             success(
                 "Settings saved successfully!\n"
@@ -436,6 +441,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
         await self.config.custom(
             "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
         ).clear()
+        self.clear_autoroom_source_config_cache(autoroom_source.id)
         await ctx.send(
             success(
                 f"**{autoroom_source.mention}** is no longer an AutoRoom Source channel."
@@ -460,6 +466,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).dest_category_id.set(dest_category.id)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             perms_required, perms_optional, details = self.check_perms_source_dest(
                 autoroom_source, dest_category, detailed=True
             )
@@ -529,6 +536,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).room_type.set(room_type)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"**{autoroom_source.mention}** will now create `{room_type}` AutoRooms."
@@ -632,6 +640,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).channel_name_type.set(room_type)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             message = (
                 f"New AutoRooms created by **{autoroom_source.mention}** "
                 f"will use the **{room_type.capitalize()}** format"
@@ -705,6 +714,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).text_channel_hint.set(hint_text)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
 
             await ctx.send(
                 success(
@@ -733,6 +743,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).text_channel_hint.clear()
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"New AutoRooms created by **{autoroom_source.mention}** will no longer have a message sent in them."
@@ -768,6 +779,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).perm_owner_manage_channels.set(new_config_value)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"AutoRoom Owners are {'now' if new_config_value else 'no longer'} able to modify their AutoRoom with native Discord controls."
@@ -794,6 +806,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).perm_send_messages.set(new_config_value)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"Users are {'now' if new_config_value else 'no longer'} able to send messages in the AutoRoom built in text channel."
@@ -826,6 +839,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).legacy_text_channel.set(value=True)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"New AutoRooms created by **{autoroom_source.mention}** will now get their own legacy text channel."
@@ -851,6 +865,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).legacy_text_channel.clear()
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"New AutoRooms created by **{autoroom_source.mention}** will no longer get their own legacy text channel."
@@ -906,6 +921,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).text_channel_topic.set(topic_text)
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
 
             await ctx.send(
                 success(
@@ -934,6 +950,7 @@ class AutoRoomSetCommands(MixinMeta, ABC):
             await self.config.custom(
                 "AUTOROOM_SOURCE", str(ctx.guild.id), str(autoroom_source.id)
             ).text_channel_topic.clear()
+            self.clear_autoroom_source_config_cache(autoroom_source.id)
             await ctx.send(
                 success(
                     f"New AutoRooms created by **{autoroom_source.mention}** will no longer have a topic set."
@@ -1,6 +1,9 @@
 """Module for template engine using Jinja2, safe for untrusted user templates."""
 
+import asyncio
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
 
 from func_timeout import FunctionTimedOut, func_timeout
@@ -10,6 +13,8 @@ from jinja2.runtime import Context
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 
 TIMEOUT = 0.25  # Maximum runtime for template rendering in seconds / should be very low to avoid DoS attacks
+CACHE_SIZE = 256  # Maximum number of compiled templates to keep around
+MAX_WORKERS = 4  # Maximum number of templates being rendered at the same time
 
 
 class TemplateTimeoutError(TemplateError):
@@ -26,7 +31,9 @@ class SilentUndefined(Undefined):
 class Template:
     """A template engine using Jinja2, safe for untrusted user templates with an immutable sandbox."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, cache_size: int = CACHE_SIZE, max_workers: int = MAX_WORKERS
+    ) -> None:
         """Set up the Jinja2 environment with an immutable sandbox."""
         self.env = ImmutableSandboxedEnvironment(
             finalize=self.finalize,
@@ -39,6 +46,13 @@ class Template:
         # Override Jinja's built-in random filter with a deterministic version
         self.env.filters["random"] = self.deterministic_random
 
+        # Compiling is the slow part of rendering, and the same few templates are rendered over and over
+        self._compile = lru_cache(maxsize=cache_size)(self.env.from_string)
+
+        # Rendering (and waiting for it to time out) happens in these threads, so the event loop isn't blocked
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
     @pass_context
     def deterministic_random(self, ctx: Context, seq: list) -> Any:  # noqa: ANN401
         """Generate a deterministic random choice from a sequence based on the context's random_seed."""
@@ -54,7 +68,17 @@ class Template:
 
     def _render_template(self, template_str: str, data: dict[str, Any]) -> str:
         """Render the template to a string."""
-        return self.env.from_string(template_str).render(data)
+        return self._compile(template_str).render(data)
+
+    def cache_info(self) -> Any:  # noqa: ANN401
+        """Return the lru_cache stats (hits, misses, maxsize, currsize) of the compiled template cache."""
+        return self._compile.cache_info()
+
+    def close(self) -> None:
+        """Shut down the rendering threads. They will be started again if anything else is rendered."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
     async def render(
         self,
@@ -62,12 +86,23 @@ class Template:
         data: dict[str, Any] | None = None,
         timeout: float = TIMEOUT,  # noqa: ASYNC109
     ) -> str:
-        """Render a template with the given data, enforcing a maximum runtime."""
+        """Render a template with the given data, enforcing a maximum runtime.
+
+        The rendering happens in a separate thread, which is killed if it runs for too long.
+        """
         if data is None:
             data = {}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="pcx_template"
+            )
         try:
-            result: str = func_timeout(
-                timeout, self._render_template, args=(template_str, data)
+            result: str = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                func_timeout,
+                timeout,
+                self._render_template,
+                (template_str, data),
             )  # type: ignore[unknown-return-type]
         except FunctionTimedOut as err:
             msg = f"Template rendering exceeded {timeout} seconds."
@@ -1,6 +1,9 @@
 """Tests for template engine using Jinja2."""
 
+import asyncio
+
 import pytest
+from jinja2.exceptions import TemplateError
 from pcx_template import (
     Template,
     TemplateTimeoutError,
@@ -926,5 +929,71 @@ async def test_multiple():
     assert expected == result
 
 
+@pytest.mark.asyncio
+async def test_compiled_template_cache():
+    tpl = Template()
+    template_str = "Hello, {{ name }}!"
+    assert await tpl.render(template_str, {"name": "World"}) == "Hello, World!"
+    assert await tpl.render(template_str, {"name": "Again"}) == "Hello, Again!"
+    cache_info = tpl.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+    assert cache_info.currsize == 1
+
+
+@pytest.mark.asyncio
+async def test_compiled_template_cache_eviction():
+    cache_size = 2
+    tpl = Template(cache_size=cache_size)
+    template_strs = ("{{ 1 }}", "{{ 2 }}", "{{ 3 }}", "{{ 1 }}")
+    for template_str in template_strs:
+        await tpl.render(template_str)
+    cache_info = tpl.cache_info()
+    assert cache_info.hits == 0
+    assert cache_info.misses == len(template_strs)
+    assert cache_info.currsize == cache_size
+
+
+@pytest.mark.asyncio
+async def test_compiled_template_cache_syntax_error():
+    tpl = Template()
+    for _ in range(2):
+        with pytest.raises(TemplateError):
+            await tpl.render("{% if %}")
+    assert tpl.cache_info().currsize == 0
+
+
+@pytest.mark.asyncio
+async def test_render_does_not_block_event_loop():
+    tpl = Template()
+    template_str = """{% for i in range(100000) %}{% for j in range(100000) %}{{ i*j }}{% endfor %}{% endfor %}"""
+    ticks = 0
+    min_ticks = 5
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    with pytest.raises(TemplateTimeoutError):
+        await tpl.render(template_str)
+    ticker_task.cancel()
+    assert ticks > min_ticks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_renders():
+    tpl = Template(max_workers=2)
+    results = await asyncio.gather(
+        *(tpl.render("{{ number }}", {"number": number}) for number in range(10))
+    )
+    assert results == [str(number) for number in range(10)]
+    tpl.close()
+    assert await tpl.render("{{ 1 + 1 }}") == "2"
+    tpl.close()
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
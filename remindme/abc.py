@@ -1,12 +1,15 @@
 """ABC for the RemindMe Cog."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Any, ClassVar
 
 import discord
 from dateutil.relativedelta import relativedelta
 from redbot.core import Config, commands
 
 from .reminder_parse import ReminderParser
+from .reminder_scheduler import ExpiringRegistry, UserReminderIndex
 
 
 class MixinMeta(ABC):
@@ -16,11 +19,15 @@ class MixinMeta(ABC):
     """
 
     config: Config
+    default_reminder_settings: ClassVar[dict[str, str | int | dict[str, int] | None]]
     reminder_parser: ReminderParser
-    me_too_reminders: dict[int, dict]
-    clicked_me_too_reminder: dict[int, set[int]]
+    reminder_index: UserReminderIndex
+    me_too_prompts: ExpiringRegistry
+    bg_loop_wakeup: asyncio.Event
     reminder_emoji: str
     MAX_REMINDER_LENGTH: int
+    MAX_SEND_WORKERS: int
+    IMPORT_EXPORT_CHUNK_SIZE: int
 
     @staticmethod
     @abstractmethod
@@ -42,6 +49,28 @@ class MixinMeta(ABC):
     ) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def add_me_too_prompt(
+        self, message: discord.Message, reminder: dict, author_id: int
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def metrics_snapshot(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load_schedule(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load_user_index(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rebuild_bucket_index(self) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     async def update_bg_task(
         self,
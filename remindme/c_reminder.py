@@ -15,7 +15,7 @@ from redbot.core.utils.chat_formatting import error
 from redbot.core.utils.predicates import MessagePredicate
 
 from .abc import MixinMeta
-from .pcx_lib import delete, embed_splitter, reply
+from .pcx_lib import embed_splitter, reply
 
 
 class ReminderCommands(MixinMeta, ABC):
@@ -34,35 +34,44 @@ class ReminderCommands(MixinMeta, ABC):
         `added` for ordering by when the reminder was added,
         `id` for ordering by ID
         """
-        # Grab users reminders and format them so that we can see the user_reminder_id
-        author = ctx.message.author
-        user_reminders = []
-        user_reminders_dict = await self.config.custom(
-            "REMINDER", str(author.id)
-        ).all()  # Does NOT return default values
-        for user_reminder_id, reminder in user_reminders_dict.items():
-            reminder.update({"user_reminder_id": int(user_reminder_id)})
-            user_reminders.append(reminder)
+        if sort not in ("time", "added", "id"):
+            await reply(
+                ctx,
+                "That is not a valid sorting option. Choose from `time` (default), `added`, or `id`.",
+            )
+            return
 
         # Check if they actually have any reminders
-        if not user_reminders:
+        author = ctx.message.author
+        await self.load_user_index(author.id)
+        if not self.reminder_index.count(author.id):
             await reply(ctx, "You don't have any upcoming reminders.")
             return
 
-        # Sort the reminders
+        # Grab users reminders and format them so that we can see the user_reminder_id
+        user_reminders_dict = await self.config.custom(
+            "REMINDER", str(author.id)
+        ).all()  # Does NOT return default values
         if sort == "time":
-            user_reminders.sort(key=lambda reminder_info: reminder_info["expires"])
+            # The index already keeps them sorted by time
+            user_reminder_ids = [
+                str(user_reminder_id)
+                for user_reminder_id in self.reminder_index.reminder_ids_by_expiry(
+                    author.id
+                )
+            ]
         elif sort == "added":
-            pass
-        elif sort == "id":
-            user_reminders.sort(
-                key=lambda reminder_info: reminder_info["user_reminder_id"]
-            )
+            user_reminder_ids = list(user_reminders_dict)
         else:
-            await reply(
-                ctx,
-                "That is not a valid sorting option. Choose from `time` (default), `added`, or `id`.",
-            )
+            user_reminder_ids = sorted(user_reminders_dict, key=int)
+        user_reminders = []
+        for user_reminder_id in user_reminder_ids:
+            reminder = user_reminders_dict.get(user_reminder_id)
+            if reminder:
+                reminder.update({"user_reminder_id": int(user_reminder_id)})
+                user_reminders.append(reminder)
+        if not user_reminders:
+            await reply(ctx, "You don't have any upcoming reminders.")
             return
 
         # Make a pretty embed listing the reminders
@@ -253,10 +262,8 @@ class ReminderCommands(MixinMeta, ABC):
         # Check that user is allowed to make a new reminder
         author = ctx.message.author
         maximum = await self.config.max_user_reminders()
-        users_reminders = await self.config.custom(
-            "REMINDER", str(author.id)
-        ).all()  # Does NOT return default values
-        if len(users_reminders) > maximum - 1:
+        await self.load_user_index(author.id)
+        if self.reminder_index.count(author.id) > maximum - 1:
             await self.send_too_many_message(ctx, maximum)
             return
 
@@ -312,19 +319,16 @@ class ReminderCommands(MixinMeta, ABC):
                 f"If anyone else would like {'these reminders' if parse_result['repeat_delta'] else 'to be reminded'} as well, "
                 "click the bell below!"
             )
-            self.me_too_reminders[query.id] = new_reminder
-            self.clicked_me_too_reminder[query.id] = {author.id}
+            self.add_me_too_prompt(query, new_reminder, author.id)
             await query.add_reaction(self.reminder_emoji)
-            await asyncio.sleep(30)
-            await delete(query)
-            del self.me_too_reminders[query.id]
-            del self.clicked_me_too_reminder[query.id]
 
     async def _delete_reminder(self, ctx: commands.Context, index: str) -> None:
         """Logic to delete reminders."""
         if not index:
             return
         author = ctx.message.author
+        # So that update_bg_task knows which expiry buckets to clean up
+        await self.load_user_index(author.id)
 
         if index == "all":
             all_users_reminders = self.config.custom("REMINDER", str(author.id))
@@ -390,6 +394,8 @@ class ReminderCommands(MixinMeta, ABC):
     async def _get_reminder_config_group(
         self, ctx: commands.Context, user_id: int, user_reminder_id: int
     ) -> Group | None:
+        # So that update_bg_task knows which expiry bucket the reminder was in
+        await self.load_user_index(user_id)
         config_reminder = self.config.custom(
             "REMINDER", str(user_id), str(user_reminder_id)
         )
@@ -1,9 +1,17 @@
 """Commands for [p]remindmeset."""
 
+import asyncio
+import datetime
+import json
 from abc import ABC
+from pathlib import Path
+from typing import Any, TextIO
 
+import discord
+from dateutil.relativedelta import relativedelta
 from redbot.core import checks, commands
-from redbot.core.utils.chat_formatting import success
+from redbot.core.data_manager import cog_data_path, storage_type
+from redbot.core.utils.chat_formatting import error, humanize_number, success
 
 from .abc import MixinMeta
 from .pcx_lib import SettingDisplay
@@ -36,6 +44,19 @@ class RemindMeSetCommands(MixinMeta, ABC):
             global_section.add(
                 "Maximum reminders per user", await self.config.max_user_reminders()
             )
+            global_section.add(
+                "Reminder delivery workers", await self.config.send_workers()
+            )
+            global_section.add(
+                "Show missed repeating reminders",
+                "Enabled" if await self.config.show_missed_repeats() else "Disabled",
+            )
+            sharded_scheduling = "Disabled"
+            if await self.config.sharded_scheduling():
+                sharded_scheduling = "Enabled"
+                if ctx.bot.shard_ids is not None:
+                    sharded_scheduling += f" (shards {', '.join(str(shard_id) for shard_id in sorted(ctx.bot.shard_ids))} of {ctx.bot.shard_count})"
+            global_section.add("Sharded scheduling", sharded_scheduling)
 
             non_repeating_reminders = 0
             repeating_reminders = 0
@@ -96,3 +117,365 @@ class RemindMeSetCommands(MixinMeta, ABC):
                 f"Maximum reminders per user is now set to {await self.config.max_user_reminders()}"
             )
         )
+
+    @remindmeset.command()
+    @checks.is_owner()
+    async def workers(self, ctx: commands.Context, workers: int) -> None:
+        """Global: Set how many reminders can be sent out at the same time.
+
+        This mostly matters after the bot has been offline for a while, when there is a backlog of reminders to send.
+        Discord rate limits are still respected, so there isn't much benefit to setting this very high.
+        """
+        if not 1 <= workers <= self.MAX_SEND_WORKERS:
+            await ctx.send(
+                error(
+                    f"The number of workers must be between 1 and {self.MAX_SEND_WORKERS}."
+                )
+            )
+            return
+        await self.config.send_workers.set(workers)
+        await ctx.send(
+            success(
+                f"Up to {workers} {'reminder' if workers == 1 else 'reminders'} will now be sent at the same time."
+            )
+        )
+
+    @remindmeset.command()
+    @checks.is_owner()
+    async def missed(self, ctx: commands.Context) -> None:
+        """Global: Toggle mentioning how many repeats of a repeating reminder were missed.
+
+        If the bot was offline while a repeating reminder should have been sent multiple times, only one reminder is sent when it comes back.
+        With this enabled, that reminder will also say how many of the repeats it is covering for.
+        """
+        show_missed_repeats = not await self.config.show_missed_repeats()
+        await self.config.show_missed_repeats.set(show_missed_repeats)
+        await ctx.send(
+            success(
+                f"Repeating reminders will {'now' if show_missed_repeats else 'no longer'} mention how many repeats were missed."
+            )
+        )
+
+    @remindmeset.command()
+    @checks.is_owner()
+    async def sharded(self, ctx: commands.Context) -> None:
+        """Global: Toggle sharded scheduling, for bots that are split across multiple processes.
+
+        With this enabled, each process only sends reminders for the users on its own shards, and a lease file in this cogs data folder makes sure no reminder is sent twice.
+        All processes need to share the same database config backend (such as PostgreSQL or MongoDB) and data folder.
+        This can't be enabled with the JSON backend, as each process keeps its own copy of the config in memory.
+        New reminders are picked up by the responsible process within a minute.
+        Leave this disabled if your bot runs as a single process.
+        """
+        sharded = not await self.config.sharded_scheduling()
+        if sharded and storage_type() == "JSON":
+            await ctx.send(
+                error(
+                    "Sharded scheduling needs a database config backend shared by all processes, "
+                    "but this bot uses the JSON backend."
+                )
+            )
+            return
+        await self.config.sharded_scheduling.set(sharded)
+        await self.load_schedule()
+        self.bg_loop_wakeup.set()
+        await ctx.send(
+            success(
+                f"Sharded scheduling is now {'enabled' if sharded else 'disabled'}."
+            )
+        )
+
+    @remindmeset.command()
+    @checks.is_owner()
+    async def stats(self, ctx: commands.Context) -> None:
+        """Global: Display how well the reminder scheduler is keeping up.
+
+        Counters are since the cog was loaded. Send lateness is how long after its due time a reminder was actually sent.
+        """
+        metrics = self.metrics_snapshot()
+
+        scheduler_section = SettingDisplay("Scheduler")
+        scheduler_section.add("Scheduled reminders", metrics["scheduled"])
+        scheduler_section.add(
+            "Next reminder due",
+            self._humanize_seconds_from_now(metrics["next_due_in"]),
+        )
+        scheduler_section.add("Reminders waiting to retry", metrics["retry_queue"])
+        scheduler_section.add(
+            "Next retry", self._humanize_seconds_from_now(metrics["next_retry_in"])
+        )
+        scheduler_section.add("Unsaved reminder changes", metrics["unsaved_changes"])
+        scheduler_section.add('Active "me too" prompts', metrics["me_too_prompts"])
+
+        delivery_section = SettingDisplay("Delivery")
+        delivery_section.add("Sent", metrics["sent"])
+        delivery_section.add("Failed attempts", metrics["failed"])
+        delivery_section.add("Undeliverable (deleted)", metrics["undeliverable"])
+        delivery_section.add("Batches", metrics["batches"])
+        delivery_section.add("Schedule loads", metrics["rescans"])
+        delivery_section.add("Stale schedule entries", metrics["stale"])
+
+        latency = metrics["send_latency"]
+        latency_section = SettingDisplay("Send Lateness")
+        if latency["count"]:
+            for percentile in ("p50", "p95", "p99"):
+                latency_section.add(
+                    percentile, self._humanize_bucket(latency[percentile])
+                )
+            latency_section.add("max", f"{latency['max']:.1f}s")
+            previous = 0
+            for bucket, cumulative in latency["buckets"].items():
+                latency_section.add(
+                    self._humanize_bucket(bucket), cumulative - previous
+                )
+                previous = cumulative
+
+        await ctx.send(scheduler_section.display(delivery_section, latency_section))
+
+    @staticmethod
+    def _humanize_bucket(bucket: float) -> str:
+        """Format a latency bucket upper bound."""
+        if bucket == float("inf"):
+            return "> 1 day"
+        return f"<= {int(bucket)}s"
+
+    def _humanize_seconds_from_now(self, seconds: float | None) -> str:
+        """Format how far away something is."""
+        if seconds is None:
+            return "None"
+        if seconds <= 0:
+            return "Now"
+        return f"In {self.humanize_relativedelta(relativedelta(seconds=int(seconds)))}"
+
+    @remindmeset.command()
+    @checks.is_owner()
+    async def rebuildindex(self, ctx: commands.Context) -> None:
+        """Global: Rebuild the index that is used to find reminders that are due.
+
+        Only needed if reminders are not being sent out, for example after the config was edited by hand or restored from an older backup.
+        """
+        async with ctx.typing():
+            changed = await self.rebuild_bucket_index()
+            await self.load_schedule()
+        self.bg_loop_wakeup.set()
+        await ctx.send(
+            success(
+                f"Reminder index rebuilt, {humanize_number(changed)} {'entry was' if changed == 1 else 'entries were'} added or removed."
+            )
+        )
+
+    @remindmeset.command(name="export")
+    @checks.is_owner()
+    async def export_reminders(self, ctx: commands.Context) -> None:
+        """Global: Export all reminders to a file.
+
+        The file has one reminder per line, and can be loaded into another bot with `[p]remindmeset import`.
+        """
+        export_path = cog_data_path(self) / (
+            f"reminders-{int(datetime.datetime.now(datetime.UTC).timestamp())}.jsonl"
+        )
+        exported = 0
+        async with ctx.typing():
+            export_file = await asyncio.to_thread(
+                export_path.open, "w", encoding="utf-8"
+            )
+            try:
+                # Read the reminders themselves rather than going by the expiry bucket index,
+                # so that nothing is left out if the index is missing any of them
+                all_reminders = await self.config.custom(
+                    "REMINDER"
+                ).all()  # Does NOT return default values
+                user_ids = sorted(int(user_id) for user_id in all_reminders)
+                for chunk_start in range(
+                    0, len(user_ids), self.IMPORT_EXPORT_CHUNK_SIZE
+                ):
+                    lines = []
+                    for user_id in user_ids[
+                        chunk_start : chunk_start + self.IMPORT_EXPORT_CHUNK_SIZE
+                    ]:
+                        users_reminders = all_reminders[str(user_id)]
+                        for (
+                            user_reminder_id,
+                            partial_reminder,
+                        ) in users_reminders.items():
+                            lines.append(
+                                json.dumps(
+                                    {
+                                        "user_id": user_id,
+                                        "user_reminder_id": int(user_reminder_id),
+                                        **partial_reminder,
+                                    },
+                                    separators=(",", ":"),
+                                )
+                                + "\n"
+                            )
+                    await asyncio.to_thread(export_file.write, "".join(lines))
+                    exported += len(lines)
+            finally:
+                await asyncio.to_thread(export_file.close)
+
+        message = f"Exported {humanize_number(exported)} {'reminder' if exported == 1 else 'reminders'}"
+        filesize_limit = ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024
+        if export_path.stat().st_size < filesize_limit:
+            await ctx.send(
+                success(f"{message}."),
+                file=discord.File(export_path, filename=export_path.name),
+            )
+        else:
+            await ctx.send(
+                success(
+                    f"{message}. The file is too big to upload here, so you will find it at `{export_path}`"
+                )
+            )
+
+    @remindmeset.command(name="import")
+    @checks.is_owner()
+    async def import_reminders(
+        self, ctx: commands.Context, filename: str | None = None
+    ) -> None:
+        """Global: Import reminders from a file made by `[p]remindmeset export`.
+
+        Either attach the file to the command message, or pass the name of a file in this cogs data folder.
+        Reminders keep their ID# if the user doesn't already have a reminder with that ID#.
+        Reminders that already exist are skipped, so importing the same file twice is safe.
+        The maximum reminders per user setting is not enforced for imported reminders.
+        """
+        if ctx.message.attachments:
+            import_path = cog_data_path(self) / "import.jsonl"
+            await ctx.message.attachments[0].save(import_path)
+        elif filename:
+            import_path = cog_data_path(self) / Path(filename).name
+            if not import_path.is_file():
+                await ctx.send(error(f"I couldn't find `{import_path}`."))
+                return
+        else:
+            await ctx.send_help()
+            return
+
+        imported = 0
+        invalid_lines = []
+        # user id -> fingerprints of their reminders, to skip ones that are already there
+        existing_reminders: dict[int, set[str]] = {}
+        async with ctx.typing():
+            import_file = await asyncio.to_thread(import_path.open, encoding="utf-8")
+            try:
+                line_number = 0
+                while lines := await asyncio.to_thread(
+                    self._read_lines, import_file, self.IMPORT_EXPORT_CHUNK_SIZE
+                ):
+                    for line in lines:
+                        line_number += 1
+                        if not line.strip():
+                            continue
+                        parsed = self._parse_exported_reminder(line)
+                        if not parsed:
+                            invalid_lines.append(line_number)
+                            continue
+                        user_id, user_reminder_id, partial_reminder = parsed
+                        await self.load_user_index(user_id)
+                        if user_id not in existing_reminders:
+                            existing_reminders[user_id] = {
+                                self._reminder_fingerprint(reminder)
+                                for reminder in (
+                                    await self.config.custom(
+                                        "REMINDER", str(user_id)
+                                    ).all()
+                                ).values()
+                            }
+                        fingerprint = self._reminder_fingerprint(partial_reminder)
+                        if fingerprint in existing_reminders[user_id]:
+                            # Already imported (possibly under a different ID#)
+                            continue
+                        if user_reminder_id in self.reminder_index.user_reminders(
+                            user_id
+                        ):
+                            user_reminder_id = self.reminder_index.next_free_id(user_id)
+                        await self.config.custom(
+                            "REMINDER", str(user_id), str(user_reminder_id)
+                        ).set(partial_reminder)
+                        await self.update_bg_task(
+                            user_id, user_reminder_id, partial_reminder
+                        )
+                        existing_reminders[user_id].add(fingerprint)
+                        imported += 1
+            finally:
+                await asyncio.to_thread(import_file.close)
+
+        message = success(
+            f"Imported {humanize_number(imported)} {'reminder' if imported == 1 else 'reminders'}."
+        )
+        if invalid_lines:
+            message += "\n" + error(
+                f"Skipped {humanize_number(len(invalid_lines))} invalid "
+                f"{'line' if len(invalid_lines) == 1 else 'lines'}, starting with line "
+                f"{', '.join(str(line_number) for line_number in invalid_lines[:10])}."
+            )
+        await ctx.send(message)
+
+    def _reminder_fingerprint(self, partial_reminder: dict[str, Any]) -> str:
+        """Get a string that is the same for any two identical reminders."""
+        return json.dumps(
+            {**self.default_reminder_settings, **partial_reminder}, sort_keys=True
+        )
+
+    @staticmethod
+    def _read_lines(file: TextIO, count: int) -> list[str]:
+        """Read up to count lines from a file."""
+        lines = []
+        for line in file:
+            lines.append(line)
+            if len(lines) >= count:
+                break
+        return lines
+
+    def _parse_exported_reminder(
+        self, line: str
+    ) -> tuple[int, int, dict[str, Any]] | None:
+        """Parse and validate one line of a reminder export file."""
+        try:
+            reminder = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(reminder, dict):
+            return None
+        user_id = reminder.pop("user_id", None)
+        user_reminder_id = reminder.pop("user_reminder_id", None)
+        if not self._is_int(user_id) or not self._is_int(user_reminder_id):
+            return None
+        if user_id <= 0 or user_reminder_id <= 0:
+            return None
+        if not set(reminder).issubset(self.default_reminder_settings):
+            return None
+        if not isinstance(reminder.get("text", ""), str):
+            return None
+        if len(reminder.get("text", "")) > self.MAX_REMINDER_LENGTH:
+            return None
+        if not self._is_int(reminder.get("created")) or not self._is_int(
+            reminder.get("expires")
+        ):
+            return None
+        if reminder.get("jump_link") is not None and not isinstance(
+            reminder["jump_link"], str
+        ):
+            return None
+        repeat = reminder.get("repeat", {})
+        if not isinstance(repeat, dict) or not all(
+            key in ("years", "months", "weeks", "days", "hours", "minutes", "seconds")
+            and self._is_int(value)
+            for key, value in repeat.items()
+        ):
+            return None
+        try:
+            # The reminder (and its next repeat) needs to be before the year 9999
+            datetime.datetime.fromtimestamp(reminder["created"], datetime.UTC)
+            datetime.datetime.fromtimestamp(reminder["expires"], datetime.UTC)
+            if repeat:
+                datetime.datetime.now(datetime.UTC) + relativedelta(**repeat)
+        except (OverflowError, ValueError, OSError):
+            return None
+        return user_id, user_reminder_id, reminder
+
+    @staticmethod
+    def _is_int(value: Any) -> bool:  # noqa: ANN401
+        """Check if a value is an int (and not a bool)."""
+        return isinstance(value, int) and not isinstance(value, bool)
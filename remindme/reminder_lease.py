@@ -0,0 +1,121 @@
+"""A sqlite backed lease store, so that reminders are only sent once across processes."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+__author__ = "PhasecoreX"
+
+
+class ReminderLeaseStore:
+    """Leases on individual reminder sends, shared by every process that uses the same file.
+
+    A lease is for a single send of a reminder, identified by (user_id, user_reminder_id, expires),
+    so the next repeat of a repeating reminder gets its own lease. A process must claim a lease
+    before sending, and then either complete it (so nobody sends it again) or release it
+    (so it can be retried). Leases that are never completed or released expire on their own,
+    in case the process holding them dies.
+
+    All methods block, so they should be run in a thread. They share a single connection,
+    so only one of them runs at a time.
+    """
+
+    def __init__(self, path: Path, owner: str) -> None:
+        """Set up the lease store."""
+        self.path = path
+        self.owner = owner
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lease ("
+                "user_id INTEGER NOT NULL, "
+                "user_reminder_id INTEGER NOT NULL, "
+                "expires INTEGER NOT NULL, "
+                "owner TEXT NOT NULL, "
+                "lease_until REAL NOT NULL, "
+                "done INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (user_id, user_reminder_id, expires))"
+            )
+        return self._connection
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def claim(
+        self,
+        user_id: int,
+        user_reminder_id: int,
+        expires: int,
+        timestamp: float,
+        lease_seconds: float,
+    ) -> bool:
+        """Try to claim a reminder send.
+
+        Returns False if it was already sent, or if someone (including us) is currently sending it.
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT lease_until, done FROM lease "
+                    "WHERE user_id = ? AND user_reminder_id = ? AND expires = ?",
+                    (user_id, user_reminder_id, expires),
+                ).fetchone()
+                if row is not None and (row[1] or row[0] > timestamp):
+                    connection.execute("ROLLBACK")
+                    return False
+                connection.execute(
+                    "INSERT OR REPLACE INTO lease "
+                    "(user_id, user_reminder_id, expires, owner, lease_until, done) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (
+                        user_id,
+                        user_reminder_id,
+                        expires,
+                        self.owner,
+                        timestamp + lease_seconds,
+                    ),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return True
+
+    def complete(self, user_id: int, user_reminder_id: int, expires: int) -> None:
+        """Mark a claimed reminder send as done, so that it is never sent again."""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE lease SET done = 1 "
+                "WHERE user_id = ? AND user_reminder_id = ? AND expires = ? AND owner = ?",
+                (user_id, user_reminder_id, expires, self.owner),
+            )
+
+    def release(self, user_id: int, user_reminder_id: int, expires: int) -> None:
+        """Give up a claimed reminder send, so that it can be claimed again."""
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM lease "
+                "WHERE user_id = ? AND user_reminder_id = ? AND expires = ? AND owner = ? AND done = 0",
+                (user_id, user_reminder_id, expires, self.owner),
+            )
+
+    def prune(self, before: int) -> None:
+        """Forget about completed sends of reminders that expired before the given timestamp."""
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM lease WHERE done = 1 AND expires < ?", (before,)
+            )
@@ -0,0 +1,76 @@
+"""Unit tests for the reminder lease store."""
+
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import reminder_lease
+
+DISTINCT_SENDS = 50
+
+
+class TestCases(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = Path(self.directory.name) / "leases.sqlite3"
+        self.first = reminder_lease.ReminderLeaseStore(path, "first")
+        self.second = reminder_lease.ReminderLeaseStore(path, "second")
+
+    def tearDown(self):
+        self.first.close()
+        self.second.close()
+        self.directory.cleanup()
+
+    def test_claim_once(self):
+        assert self.first.claim(1, 1, 100, 0, 60)
+        assert not self.second.claim(1, 1, 100, 0, 60)
+        assert not self.first.claim(1, 1, 100, 0, 60)
+        # A different send of the same reminder is its own lease
+        assert self.second.claim(1, 1, 200, 0, 60)
+
+    def test_complete(self):
+        assert self.first.claim(1, 1, 100, 0, 60)
+        self.first.complete(1, 1, 100)
+        assert not self.second.claim(1, 1, 100, 1000, 60)
+
+    def test_release(self):
+        assert self.first.claim(1, 1, 100, 0, 60)
+        self.second.release(1, 1, 100)  # Not theirs to release
+        assert not self.second.claim(1, 1, 100, 0, 60)
+        self.first.release(1, 1, 100)
+        assert self.second.claim(1, 1, 100, 0, 60)
+
+    def test_lease_expires(self):
+        assert self.first.claim(1, 1, 100, 0, 60)
+        assert not self.second.claim(1, 1, 100, 59, 60)
+        assert self.second.claim(1, 1, 100, 61, 60)
+        # The first process lost its lease, so it can't complete it anymore
+        self.first.complete(1, 1, 100)
+        self.second.release(1, 1, 100)
+        assert self.first.claim(1, 1, 100, 61, 60)
+
+    def test_prune(self):
+        assert self.first.claim(1, 1, 100, 0, 60)
+        self.first.complete(1, 1, 100)
+        self.first.prune(100)
+        assert not self.second.claim(1, 1, 100, 0, 60)
+        self.first.prune(101)
+        assert self.second.claim(1, 1, 100, 0, 60)
+
+    def test_threads(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            claimed = list(
+                executor.map(
+                    lambda expires: self.first.claim(
+                        1, 1, expires % DISTINCT_SENDS, 0, 60
+                    ),
+                    range(DISTINCT_SENDS * 4),
+                )
+            )
+        assert claimed.count(True) == DISTINCT_SENDS
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
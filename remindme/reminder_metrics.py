@@ -0,0 +1,90 @@
+"""Metrics for the remindme background loop."""
+
+import bisect
+import time
+from typing import Any
+
+__author__ = "PhasecoreX"
+
+
+class LatencyHistogram:
+    """A fixed bucket histogram of how late reminders were sent, in seconds."""
+
+    BUCKETS = (1, 5, 15, 30, 60, 300, 900, 3600, 86400)
+
+    def __init__(self) -> None:
+        """Set up the histogram."""
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a single latency."""
+        seconds = max(0.0, seconds)
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket that the given percentile falls in (capped at the max).
+
+        Returns infinity if it falls in the overflow bucket, or None if nothing was observed.
+        """
+        if not self.total:
+            return None
+        rank = self.total * percent / 100
+        seen = 0
+        for bucket, count in zip(self.BUCKETS, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return min(float(bucket), self.max)
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the histogram as a dict, with cumulative bucket counts (like Prometheus)."""
+        cumulative = 0
+        buckets = {}
+        for bucket, count in zip(
+            (*self.BUCKETS, float("inf")), self.counts, strict=True
+        ):
+            cumulative += count
+            buckets[bucket] = cumulative
+        return {
+            "buckets": buckets,
+            "count": self.total,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class ReminderMetrics:
+    """Counters for the remindme background loop, since the cog was loaded."""
+
+    def __init__(self) -> None:
+        """Set up the metrics."""
+        self.started = time.time()
+        self.send_latency = LatencyHistogram()
+        self.sent = 0
+        self.failed = 0
+        self.undeliverable = 0
+        self.batches = 0
+        self.rescans = 0
+        self.stale = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters as a dict."""
+        return {
+            "uptime": time.time() - self.started,
+            "sent": self.sent,
+            "failed": self.failed,
+            "undeliverable": self.undeliverable,
+            "batches": self.batches,
+            "rescans": self.rescans,
+            "stale": self.stale,
+            "send_latency": self.send_latency.snapshot(),
+        }
@@ -0,0 +1,44 @@
+"""Unit tests for the reminder metrics."""
+
+import unittest
+
+import reminder_metrics
+
+LATENCIES = (-3, 0.5, 1, 2, 4, 20, 100000)
+# Cumulative count of latencies in each bucket
+EXPECTED_BUCKETS = {
+    1: 3,
+    5: 5,
+    15: 5,
+    30: 6,
+    60: 6,
+    300: 6,
+    900: 6,
+    3600: 6,
+    86400: 6,
+    float("inf"): 7,
+}
+EXPECTED_P50 = 5
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty(self):
+        histogram = reminder_metrics.LatencyHistogram()
+        assert histogram.percentile(50) is None
+        assert histogram.snapshot()["count"] == 0
+
+    def test_observe(self):
+        histogram = reminder_metrics.LatencyHistogram()
+        for seconds in LATENCIES:
+            histogram.observe(seconds)
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == len(LATENCIES)
+        assert snapshot["max"] == max(LATENCIES)
+        assert snapshot["buckets"] == EXPECTED_BUCKETS
+        assert snapshot["p50"] == EXPECTED_P50
+        assert snapshot["p99"] == float("inf")
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
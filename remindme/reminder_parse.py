@@ -1,5 +1,7 @@
 """A parser for remindme commands."""
 
+import re
+from functools import lru_cache
 from typing import Any
 
 from pyparsing import (
@@ -19,6 +21,36 @@ from pyparsing import (
 
 __author__ = "PhasecoreX"
 
+PARSE_CACHE_SIZE = 1024
+
+# These mirror the grammar below: same units in the same order, same whitespace as pyparsing
+_WHITESPACE = r"[ \t\n\r]*"
+_UNITS = {
+    "years": "years|year|y",
+    "months": "months|month|mo",
+    "weeks": "weeks|week|w",
+    "days": "days|day|d",
+    "hours": "hours|hour|hrs|hr|h",
+    "minutes": "minutes|minute|mins|min|m",
+    "seconds": "seconds|second|secs|sec|s",
+}
+# Atomic groups and possessive quantifiers, since pyparsing doesn't backtrack into these either
+_TIME_UNIT_RE = re.compile(
+    rf"(?P<number>[0-9]++){_WHITESPACE}(?>"
+    + "|".join(f"(?P<{name}>{units})" for name, units in _UNITS.items())
+    + ")",
+    re.IGNORECASE | re.ASCII,
+)
+_TIME_UNIT = rf"[0-9]++{_WHITESPACE}(?>{'|'.join(_UNITS.values())})"
+_FAST_PATH_RE = re.compile(
+    rf"{_WHITESPACE}(?:(?P<every>every)|(?:in)?+){_WHITESPACE}"
+    rf"(?P<time>{_TIME_UNIT}(?:{_WHITESPACE},?+{_WHITESPACE}(?:and)?+{_WHITESPACE}{_TIME_UNIT})*+)"
+    rf"{_WHITESPACE}(?:to)?+(?P<text>.*)",
+    re.IGNORECASE | re.ASCII | re.DOTALL,
+)
+# If the reminder text has something that looks like another time in it, let pyparsing figure it out
+_FAST_PATH_BAIL_RE = re.compile(r"(?:IN|EVERY)\s*[0-9]")
+
 
 class ReminderParser:
     """A parser for remindme commands."""
@@ -145,8 +177,54 @@ class ReminderParser:
         )
 
         self.parser = template
+        self._cached_parse = lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
 
     def parse(self, text: str) -> dict[str, Any]:
         """Parse text into a reminder config dict."""
+        result = self._cached_parse(text)
+        # Don't let callers modify what is in the cache
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in result.items()
+        }
+
+    def _parse(self, text: str) -> dict[str, Any]:
+        return self.fast_parse(text) or self.grammar_parse(text)
+
+    def grammar_parse(self, text: str) -> dict[str, Any]:
+        """Parse text into a reminder config dict using the full pyparsing grammar."""
         parsed = self.parser.parseString(text, parseAll=True)
         return parsed.asDict()
+
+    @staticmethod
+    def fast_parse(text: str) -> dict[str, Any] | None:
+        """Parse the most common reminder formats without pyparsing.
+
+        Handles `[in] <time> [to] [text]` and `every <time> [to] [text]`.
+        Returns None if the text isn't in one of those formats (or might be ambiguous),
+        in which case the full grammar should be used instead.
+        """
+        # pyparsing expands tabs into spaces before parsing, which changes the reminder text
+        if "\t" in text:
+            return None
+        match = _FAST_PATH_RE.fullmatch(text)
+        if not match:
+            return None
+        # pyparsing compares case-insensitively using str.upper(), which turns some
+        # non-ASCII characters into ASCII letters. Only take the fast path for plain ASCII.
+        if not text[: match.start("text") + 8].isascii():
+            return None
+        if _FAST_PATH_BAIL_RE.search(text[match.end("time") :].upper()):
+            return None
+
+        time_dict = {}
+        for time_unit in _TIME_UNIT_RE.finditer(match["time"]):
+            name = time_unit.lastgroup
+            if name is None or name in time_dict:
+                # Duplicate units are weird, let pyparsing decide what they mean
+                return None
+            time_dict[name] = int(time_unit["number"])
+        return {
+            "every" if match["every"] else "in": time_dict,
+            "text": match["text"].strip(),
+        }
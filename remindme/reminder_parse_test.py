@@ -280,6 +280,54 @@ class TestCases(unittest.TestCase):
         assert expected == result
 
 
+class TestFastPath(unittest.TestCase):
+    fast_inputs = (
+        "2h reminder!",
+        "1y2mo3w4d5h6m7s reminder!",
+        "in 1 year, 2 months, 3 weeks, 4 days, 5 hours, 6 minutes, and 7 seconds reminder!",
+        "in 1year2 mo, 3w4 day5hour6 mins       , and 7 s reminder!",
+        "in 3 weeks to keep coding",
+        "every 3 weeks to keep coding",
+        "IN 5M TO DO THE THING",
+        "5m tomorrow",
+        "5 mon things",
+        "2h, text",
+        "2h and text",
+        "in 1 year",
+        "every 1 year",
+    )
+    slow_inputs = (
+        "to eat in 3 hours",
+        "2w every 1 year",
+        "every 1 year in 3 weeks",
+        "12 hrs write more code every 1 month",
+        "log in 5 minutes",
+        "5m5m duplicate units",
+        "5 second\N{LATIN SMALL LETTER LONG S} non-ASCII",
+        "in 5m to eat\tlunch",
+    )
+
+    def test_fast_path_matches_grammar(self):
+        for reminder in self.fast_inputs:
+            result = parser.fast_parse(reminder)
+            assert result is not None, reminder
+            assert result == parser.grammar_parse(reminder), reminder
+
+    def test_fast_path_falls_back(self):
+        for reminder in self.slow_inputs:
+            assert parser.fast_parse(reminder) is None, reminder
+            assert parser.parse(reminder) == parser.grammar_parse(reminder), reminder
+
+    def test_cache_returns_copies(self):
+        result = parser.parse("in 3 weeks to keep coding")
+        result["in"]["weeks"] = 4
+        result["text"] = "stop coding"
+        assert parser.parse("in 3 weeks to keep coding") == {
+            "in": {"weeks": 3},
+            "text": "keep coding",
+        }
+
+
 # Run unit tests from command line
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,467 @@
+"""An in-memory scheduler for remindme reminders."""
+
+import bisect
+import datetime
+import heapq
+import random
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any
+
+from dateutil.relativedelta import relativedelta
+
+__author__ = "PhasecoreX"
+
+ReminderKey = tuple[int, int]  # (user_id, user_reminder_id)
+
+
+def next_repeat_time(
+    start: datetime.datetime, repeat: relativedelta, after: datetime.datetime
+) -> tuple[datetime.datetime, int]:
+    """Find the first repeat of start that comes after the given time.
+
+    Returns the time of that repeat, as well as how many repeats it is from start.
+    This always gives the same result as adding repeat to start one at a time.
+    Repeats without months or years jump straight to an estimate and then correct it,
+    so they take the same amount of time no matter how far in the past start is.
+    Raises OverflowError or ValueError if the repeat would be after the year 9999.
+    """
+    if start > after:
+        return start, 0
+    period = ((start + repeat) - start).total_seconds()
+    if period <= 0:
+        msg = "Repeat must move forward in time"
+        raise ValueError(msg)
+    if repeat.years or repeat.months:
+        # Adding a month to the end of a month sticks to the shorter months day from then on
+        # (Jan 31 -> Feb 29 -> Mar 29), so these need to be added one at a time.
+        # There are at most 12 of these a year, so this is still quick.
+        repeats = 0
+        while start <= after:
+            start += repeat
+            repeats += 1
+        return start, repeats
+    repeats = max(1, int((after - start).total_seconds() // period))
+    while start + repeat * repeats <= after:
+        repeats += 1
+    while repeats > 1 and start + repeat * (repeats - 1) > after:
+        repeats -= 1
+    return start + repeat * repeats, repeats
+
+
+class ReminderScheduler:
+    """A min-heap of reminder expiry times.
+
+    Only the keys and expiry times of reminders are kept in memory, the reminders themselves
+    stay in the config. Updated and removed reminders leave stale entries in the heap, which
+    are lazily discarded when they reach the top (or when the heap is compacted).
+    """
+
+    def __init__(self) -> None:
+        """Set up the scheduler."""
+        self._heap: list[tuple[int, int, int]] = []
+        self._expires: dict[ReminderKey, int] = {}
+        self._users: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of scheduled reminders."""
+        return len(self._expires)
+
+    def __contains__(self, key: ReminderKey) -> bool:
+        """Check if a reminder is scheduled."""
+        return key in self._expires
+
+    def clear(self) -> None:
+        """Remove all scheduled reminders."""
+        self._heap.clear()
+        self._expires.clear()
+        self._users.clear()
+
+    def load(self, all_reminders: dict[str, dict[str, dict]]) -> None:
+        """Replace the schedule with the contents of a REMINDER config dump."""
+        self.clear()
+        for user_id, users_reminders in all_reminders.items():
+            for user_reminder_id, partial_reminder in users_reminders.items():
+                key = (int(user_id), int(user_reminder_id))
+                self._expires[key] = partial_reminder["expires"]
+                self._users.setdefault(key[0], set()).add(key[1])
+        self._heap = [
+            (expires, user_id, user_reminder_id)
+            for (user_id, user_reminder_id), expires in self._expires.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def schedule(self, user_id: int, user_reminder_id: int, expires: int) -> None:
+        """Add a reminder to the schedule, or update its expiry time."""
+        key = (user_id, user_reminder_id)
+        if self._expires.get(key) == expires:
+            return
+        self._expires[key] = expires
+        self._users.setdefault(user_id, set()).add(user_reminder_id)
+        heapq.heappush(self._heap, (expires, user_id, user_reminder_id))
+        self._maybe_compact()
+
+    def unschedule(self, user_id: int, user_reminder_id: int | None = None) -> None:
+        """Remove a reminder from the schedule.
+
+        If user_reminder_id is None, all of the users reminders are removed.
+        """
+        if user_reminder_id is None:
+            user_reminder_ids = self._users.pop(user_id, set())
+        else:
+            user_reminder_ids = {user_reminder_id}
+            users_set = self._users.get(user_id)
+            if users_set is not None:
+                users_set.discard(user_reminder_id)
+                if not users_set:
+                    del self._users[user_id]
+        for reminder_id in user_reminder_ids:
+            self._expires.pop((user_id, reminder_id), None)
+        self._maybe_compact()
+
+    def peek(self) -> tuple[int, int, int] | None:
+        """Return the soonest expiring reminder as (expires, user_id, user_reminder_id) without removing it."""
+        heap = self._heap
+        while heap:
+            expires, user_id, user_reminder_id = heap[0]
+            if self._expires.get((user_id, user_reminder_id)) == expires:
+                return heap[0]
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def pop_due(self, timestamp: float) -> list[ReminderKey]:
+        """Remove and return every reminder that expires at or before the given timestamp, soonest first."""
+        return [
+            (user_id, user_reminder_id)
+            for _, user_id, user_reminder_id in self.pop_due_with_expires(timestamp)
+        ]
+
+    def pop_due_with_expires(self, timestamp: float) -> list[tuple[int, int, int]]:
+        """Remove and return every due reminder as (expires, user_id, user_reminder_id), soonest first."""
+        due = []
+        while (next_reminder := self.peek()) and next_reminder[0] <= timestamp:
+            heapq.heappop(self._heap)
+            self.unschedule(next_reminder[1], next_reminder[2])
+            due.append(next_reminder)
+        return due
+
+    def due_before(self, timestamp: float) -> list[tuple[int, int, int]]:
+        """Return every reminder that expires at or before the given timestamp as (expires, user_id, user_reminder_id), soonest first.
+
+        Unlike pop_due, nothing is removed. Only the part of the heap that is due is visited.
+        """
+        heap = self._heap
+        due = []
+        candidates = [(heap[0], 0)] if heap else []
+        while candidates and candidates[0][0][0] <= timestamp:
+            entry, index = heapq.heappop(candidates)
+            if self._expires.get((entry[1], entry[2])) == entry[0]:
+                due.append(entry)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (heap[child], child))
+        return due
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap if it is mostly made up of stale entries."""
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [
+                (expires, user_id, user_reminder_id)
+                for (user_id, user_reminder_id), expires in self._expires.items()
+            ]
+            heapq.heapify(self._heap)
+
+
+class UserReminderIndex:
+    """An index of every reminder each user has, along with its expiry time.
+
+    Unlike the scheduler, reminders stay in here while they are being sent or retried,
+    so this can answer quota checks, pick new reminder IDs, and list reminders by time.
+
+    If lazy is True, users are only indexed once load_user is called for them, and changes
+    to users that haven't been loaded yet are ignored (the config will have them instead).
+    """
+
+    def __init__(self, *, lazy: bool = False) -> None:
+        """Set up the index."""
+        self.lazy = lazy
+        self._loaded: set[int] = set()
+        self._expires: dict[int, dict[int, int]] = {}
+        self._by_expiry: dict[int, list[tuple[int, int]]] = {}
+        self._next_free_id: dict[int, int] = {}
+
+    def load(self, all_reminders: dict[str, dict[str, dict]]) -> None:
+        """Replace the index with the contents of a REMINDER config dump."""
+        self._loaded.clear()
+        self._expires.clear()
+        self._by_expiry.clear()
+        self._next_free_id.clear()
+        for user_id, users_reminders in all_reminders.items():
+            self.load_user(int(user_id), users_reminders)
+
+    def load_user(self, user_id: int, users_reminders: dict[str, dict]) -> None:
+        """Replace a users reminders with the contents of their REMINDER config dump."""
+        self._loaded.add(user_id)
+        self._expires.pop(user_id, None)
+        self._by_expiry.pop(user_id, None)
+        self._next_free_id.pop(user_id, None)
+        for user_reminder_id, partial_reminder in users_reminders.items():
+            self.add(user_id, int(user_reminder_id), partial_reminder["expires"])
+
+    def is_loaded(self, user_id: int) -> bool:
+        """Check if a users reminders are in the index."""
+        return not self.lazy or user_id in self._loaded
+
+    def user_reminders(self, user_id: int) -> dict[int, int]:
+        """Return a users reminder IDs and their expiry times."""
+        return dict(self._expires.get(user_id, {}))
+
+    def count(self, user_id: int) -> int:
+        """Return how many reminders a user has."""
+        return len(self._expires.get(user_id, ()))
+
+    def next_free_id(self, user_id: int) -> int:
+        """Return the lowest user_reminder_id that the user isn't using."""
+        users_reminders = self._expires.get(user_id, {})
+        next_id = self._next_free_id.get(user_id, 1)
+        while next_id in users_reminders:
+            next_id += 1
+        self._next_free_id[user_id] = next_id
+        return next_id
+
+    def reminder_ids_by_expiry(self, user_id: int) -> list[int]:
+        """Return a users reminder IDs, soonest expiring first."""
+        return [
+            user_reminder_id for _, user_reminder_id in self._by_expiry.get(user_id, ())
+        ]
+
+    def add(self, user_id: int, user_reminder_id: int, expires: int) -> None:
+        """Add a reminder to the index, or update its expiry time."""
+        if not self.is_loaded(user_id):
+            return
+        users_reminders = self._expires.setdefault(user_id, {})
+        users_by_expiry = self._by_expiry.setdefault(user_id, [])
+        old_expires = users_reminders.get(user_reminder_id)
+        if old_expires == expires:
+            return
+        if old_expires is not None:
+            users_by_expiry.remove((old_expires, user_reminder_id))
+        users_reminders[user_reminder_id] = expires
+        bisect.insort(users_by_expiry, (expires, user_reminder_id))
+
+    def remove(self, user_id: int, user_reminder_id: int | None = None) -> None:
+        """Remove a reminder from the index.
+
+        If user_reminder_id is None, all of the users reminders are removed.
+        """
+        if not self.is_loaded(user_id):
+            return
+        users_reminders = self._expires.get(user_id)
+        if users_reminders is None:
+            return
+        if user_reminder_id is not None:
+            old_expires = users_reminders.pop(user_reminder_id, None)
+            if old_expires is not None:
+                self._by_expiry[user_id].remove((old_expires, user_reminder_id))
+                if user_reminder_id < self._next_free_id.get(user_id, 1):
+                    self._next_free_id[user_id] = user_reminder_id
+            if users_reminders:
+                return
+        del self._expires[user_id]
+        del self._by_expiry[user_id]
+        self._next_free_id.pop(user_id, None)
+
+
+class RetryQueue:
+    """Reminders that failed to send, waiting to be retried with exponential backoff.
+
+    A reminder stays in the queue (and keeps its attempt count) from its first failure
+    until it is discarded, which should happen once it is sent, deleted, or modified.
+    """
+
+    def __init__(self, base_delay: float, max_delay: float, max_size: int) -> None:
+        """Set up the retry queue."""
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_size = max_size
+        self._heap: list[tuple[float, int, int]] = []
+        self._retry_at: dict[ReminderKey, float] = {}
+        self._attempts: dict[ReminderKey, int] = {}
+        self._users: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of reminders that are failing to send."""
+        return len(self._attempts)
+
+    def __contains__(self, key: ReminderKey) -> bool:
+        """Check if a reminder is failing to send."""
+        return key in self._attempts
+
+    def __iter__(self) -> Iterator[ReminderKey]:
+        """Iterate over the reminders that are failing to send."""
+        return iter(list(self._attempts))
+
+    def add(self, user_id: int, user_reminder_id: int, timestamp: float) -> bool:
+        """Queue a failed reminder to be retried later.
+
+        Returns False if the queue is full and the reminder was not added.
+        """
+        key = (user_id, user_reminder_id)
+        attempts = self._attempts.get(key, 0)
+        if not attempts and len(self._attempts) >= self.max_size:
+            return False
+        self._attempts[key] = attempts + 1
+        self._users.setdefault(user_id, set()).add(user_reminder_id)
+        # Exponential backoff with "equal jitter", so that a whole batch of failures doesn't retry in lockstep
+        delay = min(self.base_delay * 2**attempts, self.max_delay)
+        retry_at = timestamp + delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+        self._retry_at[key] = retry_at
+        heapq.heappush(self._heap, (retry_at, user_id, user_reminder_id))
+        return True
+
+    def discard(self, user_id: int, user_reminder_id: int | None = None) -> None:
+        """Remove a reminder from the queue.
+
+        If user_reminder_id is None, all of the users reminders are removed.
+        """
+        if user_reminder_id is None:
+            user_reminder_ids = self._users.pop(user_id, set())
+        else:
+            user_reminder_ids = {user_reminder_id}
+            users_set = self._users.get(user_id)
+            if users_set is not None:
+                users_set.discard(user_reminder_id)
+                if not users_set:
+                    del self._users[user_id]
+        for reminder_id in user_reminder_ids:
+            self._attempts.pop((user_id, reminder_id), None)
+            self._retry_at.pop((user_id, reminder_id), None)
+
+    def attempts(self, user_id: int, user_reminder_id: int) -> int:
+        """Return how many times a reminder has failed to send."""
+        return self._attempts.get((user_id, user_reminder_id), 0)
+
+    def next_retry_time(self) -> float | None:
+        """Return the time of the soonest retry."""
+        heap = self._heap
+        while heap:
+            retry_at, user_id, user_reminder_id = heap[0]
+            if self._retry_at.get((user_id, user_reminder_id)) == retry_at:
+                return retry_at
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def pop_due(self, timestamp: float) -> list[ReminderKey]:
+        """Return every reminder that is due to be retried at or before the given timestamp.
+
+        The returned reminders stay in the queue until they are discarded or added again.
+        """
+        due = []
+        while (
+            retry_at := self.next_retry_time()
+        ) is not None and retry_at <= timestamp:
+            _, user_id, user_reminder_id = heapq.heappop(self._heap)
+            del self._retry_at[(user_id, user_reminder_id)]
+            due.append((user_id, user_reminder_id))
+        return due
+
+
+class ExpiringRegistry:
+    """A dict whose entries expire after a time to live.
+
+    Expired entries are not removed on their own, something should periodically call pop_expired
+    (sleeping until next_expiry in between) to clean them up.
+    """
+
+    def __init__(self) -> None:
+        """Set up the registry."""
+        self._heap: list[tuple[float, int]] = []
+        self._entries: dict[int, tuple[float, Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        """Check if an entry exists."""
+        return key in self._entries
+
+    def add(self, key: int, value: Any, expires: float) -> None:  # noqa: ANN401
+        """Add an entry that expires at the given time, replacing any existing entry."""
+        self._entries[key] = (expires, value)
+        heapq.heappush(self._heap, (expires, key))
+
+    def get(self, key: int) -> Any:  # noqa: ANN401
+        """Return the value of an entry, or None if there isn't one."""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def pop(self, key: int) -> Any:  # noqa: ANN401
+        """Remove an entry, returning its value (or None if there wasn't one)."""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def next_expiry(self) -> float | None:
+        """Return the time that the soonest entry expires."""
+        heap = self._heap
+        while heap:
+            expires, key = heap[0]
+            entry = self._entries.get(key)
+            if entry and entry[0] == expires:
+                return expires
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def pop_expired(self, timestamp: float) -> list[Any]:
+        """Remove and return the value of every entry that expires at or before the given timestamp."""
+        expired = []
+        while (expires := self.next_expiry()) is not None and expires <= timestamp:
+            _, key = heapq.heappop(self._heap)
+            expired.append(self._entries.pop(key)[1])
+        return expired
+
+    def pop_all(self) -> list[Any]:
+        """Remove and return the value of every entry."""
+        expired = [value for _, value in self._entries.values()]
+        self._entries.clear()
+        self._heap.clear()
+        return expired
+
+
+class LRUCache:
+    """A dict that only keeps the most recently used entries."""
+
+    def __init__(self, max_size: int) -> None:
+        """Set up the cache."""
+        self.max_size = max_size
+        self._entries: OrderedDict[int, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        """Check if an entry exists (without counting as a use)."""
+        return key in self._entries
+
+    def get(self, key: int) -> Any:  # noqa: ANN401
+        """Return the value of an entry (marking it as recently used), or None if there isn't one."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: int, value: Any) -> None:  # noqa: ANN401
+        """Add or replace an entry, evicting the least recently used entries if there are too many."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: int) -> Any:  # noqa: ANN401
+        """Remove an entry, returning its value (or None if there wasn't one)."""
+        return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
@@ -0,0 +1,385 @@
+"""Benchmark and load test for the RemindMe scheduler and reminder parser.
+
+Runs entirely offline, using an in-memory stand-in for Red's Config and a fake bot.
+From the root of the repo (with Red installed):
+
+    python -m remindme.reminder_scheduler_benchmark --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import copy
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import patch
+
+import discord
+from redbot.core import Config
+
+from .reminder_parse import ReminderParser
+from .remindme import RemindMe
+
+_MISSING = object()
+
+
+class BenchmarkConfig:
+    """Just enough of Red's Config for RemindMe, stored in a plain dict."""
+
+    def __init__(self) -> None:
+        """Set up the config."""
+        self.data: dict[str, Any] = {}
+        self.defaults: dict[str, Any] = {}
+        self.custom_identifiers: dict[str, int] = {}
+        self.locks: dict[tuple[str, ...], asyncio.Lock] = {}
+
+    def register_global(self, **defaults: Any) -> None:  # noqa: ANN401
+        """Register global defaults."""
+        self.defaults.update(defaults)
+
+    def register_guild(self, **defaults: Any) -> None:  # noqa: ANN401
+        """Register guild defaults."""
+        self.defaults["GUILD"] = defaults
+
+    def init_custom(self, group_name: str, identifier_count: int) -> None:
+        """Initialize a custom group."""
+        self.custom_identifiers[group_name] = identifier_count
+
+    def register_custom(self, group_name: str, **defaults: Any) -> None:  # noqa: ANN401
+        """Register custom group defaults."""
+        self.defaults[group_name] = defaults
+
+    def custom(self, group_name: str, *identifiers: str) -> "BenchmarkGroup":
+        """Get a custom group."""
+        return BenchmarkGroup(
+            self,
+            (group_name, *identifiers),
+            self.custom_identifiers[group_name] + 1,
+        )
+
+    def guild(self, guild: discord.Guild) -> "BenchmarkGroup":
+        """Get a guild group."""
+        return BenchmarkGroup(self, ("GUILD", str(guild.id)), 2)
+
+    def __getattr__(self, name: str) -> "BenchmarkGroup":
+        """Get a global value."""
+        return BenchmarkGroup(self, (name,), 0)
+
+    async def get_raw(self, *keys: str, default: Any = _MISSING) -> Any:  # noqa: ANN401
+        """Get a raw global value."""
+        return await BenchmarkGroup(self, (), 0).get_raw(*keys, default=default)
+
+    async def clear_raw(self, *keys: str) -> None:
+        """Clear a raw global value."""
+        await BenchmarkGroup(self, (), 0).clear_raw(*keys)
+
+
+class BenchmarkGroup:
+    """A group or value inside of a BenchmarkConfig."""
+
+    def __init__(
+        self, config: BenchmarkConfig, path: tuple[str, ...], identifier_length: int
+    ) -> None:
+        """Set up the group."""
+        self.config = config
+        self.path = path
+        self.identifier_length = identifier_length
+
+    def __getattr__(self, name: str) -> "BenchmarkGroup":
+        """Get a value inside of this group."""
+        return BenchmarkGroup(self.config, (*self.path, name), self.identifier_length)
+
+    def _default(self) -> Any:  # noqa: ANN401
+        if len(self.path) < self.identifier_length:
+            return {}
+        default = self.config.defaults
+        for key in (
+            self.path[:1] + self.path[self.identifier_length :]
+            if self.identifier_length
+            else self.path
+        ):
+            default = default.get(key, {}) if isinstance(default, dict) else {}
+        return copy.deepcopy(default)
+
+    def _get(self, path: tuple[str, ...]) -> Any:  # noqa: ANN401
+        value = self.config.data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return _MISSING
+            value = value[key]
+        return value
+
+    async def __call__(self) -> Any:  # noqa: ANN401
+        """Get the value."""
+        value = self._get(self.path)
+        if value is _MISSING:
+            return self._default()
+        return copy.deepcopy(value)
+
+    async def all(self) -> Any:  # noqa: ANN401
+        """Get the value, with defaults filled in for full identifier paths."""
+        value = await self()
+        if len(self.path) == self.identifier_length:
+            default = self._default()
+            default.update(value)
+            return default
+        return value
+
+    async def set(self, value: Any) -> None:  # noqa: ANN401
+        """Set the value."""
+        await self.set_raw(value=value)
+
+    async def clear(self) -> None:
+        """Clear the value."""
+        await self.clear_raw()
+
+    async def get_raw(self, *keys: str, default: Any = _MISSING) -> Any:  # noqa: ANN401
+        """Get a value inside of this group."""
+        value = self._get((*self.path, *keys))
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(keys)
+            return default
+        return copy.deepcopy(value)
+
+    async def set_raw(self, *keys: str, value: Any) -> None:  # noqa: ANN401
+        """Set a value inside of this group."""
+        path = (*self.path, *keys)
+        parent = self.config.data
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[path[-1]] = copy.deepcopy(value)
+
+    async def clear_raw(self, *keys: str) -> None:
+        """Clear a value inside of this group, cleaning up empty parents."""
+        path = (*self.path, *keys)
+        parents = [self.config.data]
+        for key in path[:-1]:
+            child = parents[-1].get(key)
+            if not isinstance(child, dict):
+                return
+            parents.append(child)
+        parents[-1].pop(path[-1], None)
+        for depth in range(len(parents) - 1, 0, -1):
+            if parents[depth]:
+                break
+            del parents[depth - 1][path[depth - 1]]
+
+    def get_lock(self) -> asyncio.Lock:
+        """Get a lock for this value."""
+        return self.config.locks.setdefault(self.path, asyncio.Lock())
+
+
+class BenchmarkUser:
+    """A user that receives reminders after a configurable delay."""
+
+    def __init__(self, bot: "BenchmarkBot", user_id: int) -> None:
+        """Set up the user."""
+        self.bot = bot
+        self.id = user_id
+        self.dm_channel: BenchmarkUser | None = None
+
+    async def create_dm(self) -> "BenchmarkUser":
+        """Pretend to open a DM channel, which can be sent to just like the user."""
+        self.dm_channel = self
+        return self
+
+    async def send(self, **_kwargs: Any) -> None:  # noqa: ANN401
+        """Pretend to send a DM."""
+        if self.bot.send_latency:
+            await asyncio.sleep(self.bot.send_latency)
+        self.bot.sent += 1
+        if self.bot.sent >= self.bot.expected_sends:
+            self.bot.all_sent.set()
+
+
+class BenchmarkBot:
+    """A bot that can see every user and never talks to Discord."""
+
+    def __init__(self, send_latency: float) -> None:
+        """Set up the bot."""
+        self.loop = asyncio.get_running_loop()
+        self.send_latency = send_latency
+        self.sent = 0
+        self.expected_sends = 0
+        self.all_sent = asyncio.Event()
+        self.ready = asyncio.Event()
+
+    def get_user(self, user_id: int) -> BenchmarkUser:
+        """Get a fake user."""
+        return BenchmarkUser(self, user_id)
+
+    async def wait_until_ready(self) -> None:
+        """Hold the background loop back until the backlog benchmark starts."""
+        await self.ready.wait()
+
+    async def get_embed_color(self, _user: BenchmarkUser) -> discord.Color:
+        """Get the embed color."""
+        return discord.Color.red()
+
+    async def send_to_owners(self, _content: str) -> None:
+        """Ignore owner notifications."""
+
+
+@contextmanager
+def _timer(results: dict[str, float], name: str, operations: int = 1) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    results[name] = (time.perf_counter() - start) / operations
+
+
+def _populate(
+    config: BenchmarkConfig, size: int, backlog: int, now: int
+) -> dict[str, Any]:
+    """Fill the config with size reminders spread over users, backlog of them overdue."""
+    reminders: dict[str, Any] = {}
+    for index in range(size):
+        user_id = str(100_000_000_000_000_000 + index // 10)
+        expires = (
+            now - random.randint(1, 3600)  # noqa: S311
+            if index < backlog
+            else now + random.randint(3600, 365 * 86400)  # noqa: S311
+        )
+        reminders.setdefault(user_id, {})[str(index % 10 + 1)] = {
+            "text": f"Synthetic reminder #{index}",
+            "created": now - 86400,
+            "expires": expires,
+            **({"repeat": {"days": 1}} if index % 4 == 0 else {}),
+        }
+    config.data = {"schema_version": 2, "REMINDER": reminders}
+    return reminders
+
+
+async def run_benchmark(
+    size: int,
+    operations: int,
+    backlog: int,
+    send_latency: float,
+    drain_timeout: float = 600,
+) -> dict[str, float]:
+    """Benchmark a RemindMe instance with size reminders, returning seconds per operation."""
+    results: dict[str, float] = {}
+    config = BenchmarkConfig()
+    bot = BenchmarkBot(send_latency)
+    with patch.object(Config, "get_conf", return_value=config):
+        cog = RemindMe(bot)  # type: ignore[arg-type]
+    now = int(time.time())
+    _populate(config, size, backlog, now)
+
+    # Builds the expiry bucket index, but the background loop waits for the bot to be ready
+    with _timer(results, "initialize"):
+        await cog.initialize()
+
+    # What the background loop does first, filling the schedule with overdue and soon to be due reminders
+    with _timer(results, "load"):
+        await cog._load_buckets(now)  # noqa: SLF001
+    if cog.index_warmer_task:
+        with _timer(results, "index warm-up"):
+            await cog.index_warmer_task
+
+    with _timer(results, "next reminder", operations):
+        for _ in range(operations):
+            cog.scheduler.peek()
+
+    new_user_ids = [200_000_000_000_000_000 + index for index in range(operations)]
+    with _timer(results, "insert", operations):
+        for user_id in new_user_ids:
+            await cog.insert_reminder(
+                user_id,
+                {
+                    "text": "New reminder",
+                    "created": now,
+                    "expires": now + random.randint(3600, 86400),  # noqa: S311
+                    "jump_link": None,
+                },
+            )
+
+    with _timer(results, "delete", operations):
+        for user_id in new_user_ids:
+            await cog.config.custom("REMINDER", str(user_id), "1").clear()
+            await cog.update_bg_task(user_id, 1)
+
+    if backlog:
+        with _timer(results, f"drain {backlog} overdue"):
+            bot.expected_sends = backlog
+            bot.ready.set()
+            # If the background loop dies, fail instead of waiting forever
+            await asyncio.wait_for(bot.all_sent.wait(), timeout=drain_timeout)
+
+    await cog.cog_unload()
+    return results
+
+
+def run_parser_benchmark(operations: int) -> dict[str, float]:
+    """Benchmark each way of parsing a reminder, returning seconds per parse."""
+    results: dict[str, float] = {}
+    reminder_parser = ReminderParser()
+    for reminder in ("in 5m to stretch", "every 1d to drink water"):
+        for name, function in (
+            ("grammar", reminder_parser.grammar_parse),
+            ("fast path", reminder_parser.fast_parse),
+            ("cached", reminder_parser.parse),
+        ):
+            with _timer(results, f"parse {name} {reminder!r}", operations):
+                for _ in range(operations):
+                    function(reminder)
+    return results
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000],
+        help="how many reminders to populate the config with, one run per size",
+    )
+    parser.add_argument(
+        "--operations",
+        type=int,
+        default=1000,
+        help="how many times to repeat the per-operation benchmarks",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=1000,
+        help="how many of the reminders are overdue at startup",
+    )
+    parser.add_argument(
+        "--send-latency",
+        type=float,
+        default=0.0,
+        help="simulated seconds per DM",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=600.0,
+        help="seconds to wait for the overdue reminders to be sent before giving up",
+    )
+    args = parser.parse_args()
+
+    print(f"{'reminders':>10} {'operation':<24} {'time':>12}")
+    for name, seconds in run_parser_benchmark(args.operations).items():
+        print(f"{'-':>10} {name:<24} {seconds * 1e6:>10.1f}us")
+    for size in args.sizes:
+        results = asyncio.run(
+            run_benchmark(
+                size,
+                args.operations,
+                min(args.backlog, size),
+                args.send_latency,
+                args.drain_timeout,
+            )
+        )
+        for name, seconds in results.items():
+            print(f"{size:>10} {name:<24} {seconds * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Unit tests for the reminder scheduler."""
+
+import datetime
+import unittest
+
+import pytest
+import reminder_scheduler
+from dateutil.relativedelta import relativedelta
+
+
+class TestCases(unittest.TestCase):
+    def test_empty(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        assert scheduler.peek() is None
+        assert len(scheduler) == 0
+
+    def test_load(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        scheduler.load(
+            {
+                "1": {"1": {"expires": 300}, "2": {"expires": 100}},
+                "2": {"1": {"expires": 200}},
+            }
+        )
+        assert (1, 1) in scheduler
+        assert (2, 1) in scheduler
+        assert scheduler.peek() == (100, 1, 2)
+
+    def test_reschedule(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        scheduler.schedule(1, 1, 100)
+        scheduler.schedule(2, 1, 200)
+        scheduler.schedule(1, 1, 300)
+        assert scheduler.peek() == (200, 2, 1)
+        scheduler.unschedule(2, 1)
+        assert scheduler.peek() == (300, 1, 1)
+
+    def test_unschedule_user(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        scheduler.schedule(1, 1, 100)
+        scheduler.schedule(1, 2, 200)
+        scheduler.schedule(2, 1, 300)
+        scheduler.unschedule(1)
+        assert (1, 1) not in scheduler
+        assert (1, 2) not in scheduler
+        assert scheduler.peek() == (300, 2, 1)
+
+    def test_compaction(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        for expires in range(1000):
+            scheduler.schedule(1, 1, expires)
+        assert len(scheduler) == 1
+        assert scheduler.peek() == (999, 1, 1)
+
+    def test_pop_due(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        scheduler.schedule(1, 1, 300)
+        scheduler.schedule(1, 2, 100)
+        scheduler.schedule(2, 1, 200)
+        scheduler.schedule(2, 2, 200)
+        scheduler.unschedule(2, 2)
+        assert scheduler.pop_due(250) == [(1, 2), (2, 1)]
+        assert scheduler.pop_due(250) == []
+        assert scheduler.peek() == (300, 1, 1)
+        assert scheduler.pop_due_with_expires(300) == [(300, 1, 1)]
+
+    def test_due_before(self):
+        scheduler = reminder_scheduler.ReminderScheduler()
+        user_ids = range(1, 50)
+        cutoff = 50
+        for user_id in user_ids:
+            scheduler.schedule(user_id, 1, (user_id * 37) % 101)
+        scheduler.schedule(1, 1, 1000)
+        scheduler.unschedule(2, 1)
+        expected = sorted(
+            ((user_id * 37) % 101, user_id, 1)
+            for user_id in range(3, 50)
+            if (user_id * 37) % 101 <= cutoff
+        )
+        assert scheduler.due_before(cutoff) == expected
+        assert len(scheduler) == len(user_ids) - 1
+        assert scheduler.due_before(-1) == []
+
+
+class TestUserReminderIndex(unittest.TestCase):
+    def test_load(self):
+        index = reminder_scheduler.UserReminderIndex()
+        index.load(
+            {
+                "1": {"1": {"expires": 300}, "2": {"expires": 100}},
+                "2": {"1": {"expires": 200}},
+            }
+        )
+        assert index.reminder_ids_by_expiry(1) == [2, 1]
+        assert index.reminder_ids_by_expiry(2) == [1]
+        assert index.count(3) == 0
+
+    def test_next_free_id(self):
+        index = reminder_scheduler.UserReminderIndex()
+        assert index.next_free_id(1) == 1
+        missing_id = 3
+        for user_reminder_id in range(1, 5):
+            if user_reminder_id != missing_id:
+                index.add(1, user_reminder_id, 100)
+        assert index.next_free_id(1) == missing_id
+        index.add(1, missing_id, 100)
+        assert index.next_free_id(1) == index.count(1) + 1
+        removed_id = 2
+        index.remove(1, removed_id)
+        assert index.next_free_id(1) == removed_id
+        index.remove(1)
+        assert index.next_free_id(1) == 1
+        assert index.count(1) == 0
+
+    def test_update(self):
+        index = reminder_scheduler.UserReminderIndex()
+        index.add(1, 1, 100)
+        index.add(1, 2, 200)
+        index.add(1, 1, 300)
+        assert index.reminder_ids_by_expiry(1) == [2, 1]
+        index.remove(1, 2)
+        index.remove(1, 2)
+        assert index.reminder_ids_by_expiry(1) == [1]
+        index.remove(1, 1)
+        assert index.count(1) == 0
+        assert index.reminder_ids_by_expiry(1) == []
+
+    def test_lazy(self):
+        index = reminder_scheduler.UserReminderIndex(lazy=True)
+        index.add(1, 1, 100)
+        assert not index.is_loaded(1)
+        assert index.count(1) == 0
+        index.load_user(1, {"1": {"expires": 300}, "3": {"expires": 200}})
+        assert index.is_loaded(1)
+        assert index.user_reminders(1) == {1: 300, 3: 200}
+        index.add(1, 2, 100)
+        assert index.reminder_ids_by_expiry(1) == [2, 3, 1]
+        index.remove(2)
+        assert not index.is_loaded(2)
+
+
+class TestRetryQueue(unittest.TestCase):
+    def test_backoff(self):
+        retry_queue = reminder_scheduler.RetryQueue(10, 100, 10)
+        attempt_count = 6
+        for attempt in range(attempt_count):
+            assert retry_queue.add(1, 1, 0)
+            delay = min(10 * 2**attempt, 100)
+            retry_at = retry_queue.next_retry_time()
+            assert retry_at is not None
+            assert delay / 2 <= retry_at <= delay
+            assert retry_queue.pop_due(retry_at) == [(1, 1)]
+            assert retry_queue.next_retry_time() is None
+            assert (1, 1) in retry_queue
+        assert retry_queue.attempts(1, 1) == attempt_count
+
+    def test_discard(self):
+        retry_queue = reminder_scheduler.RetryQueue(10, 100, 10)
+        retry_queue.add(1, 1, 0)
+        retry_queue.add(1, 2, 0)
+        retry_queue.add(2, 1, 0)
+        retry_queue.discard(1)
+        retry_queue.discard(2, 1)
+        assert len(retry_queue) == 0
+        assert retry_queue.next_retry_time() is None
+        assert retry_queue.pop_due(1000) == []
+
+    def test_max_size(self):
+        retry_queue = reminder_scheduler.RetryQueue(10, 100, 1)
+        assert retry_queue.add(1, 1, 0)
+        assert not retry_queue.add(1, 2, 0)
+        assert retry_queue.add(1, 1, 0)
+
+
+class TestNextRepeatTime(unittest.TestCase):
+    @staticmethod
+    def iterate(
+        start: datetime.datetime, repeat: relativedelta, after: datetime.datetime
+    ) -> tuple[datetime.datetime, int]:
+        repeats = 0
+        while start <= after:
+            start += repeat
+            repeats += 1
+        return start, repeats
+
+    def test_not_due(self):
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        result = reminder_scheduler.next_repeat_time(
+            start, relativedelta(days=1), start - relativedelta(hours=1)
+        )
+        assert result == (start, 0)
+
+    def test_matches_iteration(self):
+        start = datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.UTC)
+        for repeat in (
+            relativedelta(days=1),
+            relativedelta(days=3, hours=5),
+            relativedelta(weeks=2),
+            relativedelta(months=1),
+            relativedelta(years=1, days=1),
+        ):
+            for after in (
+                start,
+                start + relativedelta(seconds=1),
+                start + relativedelta(days=1),
+                start + relativedelta(years=3, days=17, hours=2, seconds=5),
+            ):
+                assert reminder_scheduler.next_repeat_time(
+                    start, repeat, after
+                ) == self.iterate(start, repeat, after)
+
+    def test_months(self):
+        # Same as sending it every month: Jan 31 -> Feb 29 -> Mar 29
+        start = datetime.datetime(2024, 1, 31, tzinfo=datetime.UTC)
+        after = datetime.datetime(2024, 3, 15, tzinfo=datetime.UTC)
+        result = reminder_scheduler.next_repeat_time(
+            start, relativedelta(months=1), after
+        )
+        assert result == (datetime.datetime(2024, 3, 29, tzinfo=datetime.UTC), 2)
+        assert result == self.iterate(start, relativedelta(months=1), after)
+
+    def test_overflow(self):
+        start = datetime.datetime(9999, 12, 1, tzinfo=datetime.UTC)
+        after = datetime.datetime(9999, 12, 31, tzinfo=datetime.UTC)
+        with pytest.raises((OverflowError, ValueError)):
+            reminder_scheduler.next_repeat_time(start, relativedelta(months=1), after)
+
+
+class TestExpiringRegistry(unittest.TestCase):
+    def test_expiry(self):
+        registry = reminder_scheduler.ExpiringRegistry()
+        one_expires = 10
+        two_expires = 5
+        registry.add(1, "one", one_expires)
+        registry.add(2, "two", two_expires)
+        assert registry.get(1) == "one"
+        assert registry.get(2) == "two"
+        assert registry.get(3) is None
+        assert registry.next_expiry() == two_expires
+        assert registry.pop_expired(two_expires - 1) == []
+        assert registry.pop_expired(two_expires) == ["two"]
+        assert registry.get(2) is None
+        assert registry.next_expiry() == one_expires
+
+    def test_replace_and_pop(self):
+        registry = reminder_scheduler.ExpiringRegistry()
+        registry.add(1, "one", 5)
+        registry.add(1, "uno", 20)
+        assert registry.pop_expired(10) == []
+        assert registry.get(1) == "uno"
+        assert registry.pop(1) == "uno"
+        assert registry.pop(1) is None
+        assert registry.next_expiry() is None
+
+    def test_pop_all(self):
+        registry = reminder_scheduler.ExpiringRegistry()
+        registry.add(1, "one", 5)
+        registry.add(2, "two", 10)
+        assert sorted(registry.pop_all()) == ["one", "two"]
+        assert not registry
+        assert registry.pop_expired(100) == []
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        max_size = 2
+        cache = reminder_scheduler.LRUCache(max_size)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        assert cache.get(1) == "one"
+        cache.put(3, "three")
+        assert cache.get(2) is None
+        assert len(cache) == max_size
+        cache.put(1, "uno")
+        cache.put(4, "four")
+        assert cache.get(1) == "uno"
+        assert cache.get(3) is None
+
+    def test_pop_and_clear(self):
+        cache = reminder_scheduler.LRUCache(5)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        assert cache.pop(1) == "one"
+        assert cache.pop(1) is None
+        cache.clear()
+        assert len(cache) == 0
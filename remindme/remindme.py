@@ -3,7 +3,11 @@
 import asyncio
 import datetime
 import logging
+import uuid
 from abc import ABC
+from collections.abc import Awaitable, Callable, Coroutine
+from contextlib import suppress
+from functools import lru_cache
 from typing import Any, ClassVar
 
 import discord
@@ -11,15 +15,79 @@ from dateutil.relativedelta import relativedelta
 from pyparsing import ParseException
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path, storage_type
+from redbot.core.i18n import get_locale
 from redbot.core.utils.chat_formatting import humanize_list
 
 from .c_reminder import ReminderCommands
 from .c_remindmeset import RemindMeSetCommands
-from .pcx_lib import reply
+from .pcx_lib import delete, reply
+from .reminder_lease import ReminderLeaseStore
+from .reminder_metrics import ReminderMetrics
 from .reminder_parse import ReminderParser
+from .reminder_scheduler import (
+    ExpiringRegistry,
+    LRUCache,
+    ReminderScheduler,
+    RetryQueue,
+    UserReminderIndex,
+    next_repeat_time,
+)
 
 log = logging.getLogger("red.pcxcogs.remindme")
 
+HUMANIZE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=HUMANIZE_CACHE_SIZE)
+def _humanize_dict(
+    locale: str, relative_delta_items: tuple[tuple[str, int], ...]
+) -> str:
+    """Humanize the keyword arguments of a relativedelta."""
+    relative_delta = relativedelta(**dict(relative_delta_items))
+    return _humanize_fields(
+        locale,
+        relative_delta.years,
+        relative_delta.months,
+        relative_delta.days,
+        relative_delta.hours,
+        relative_delta.minutes,
+        relative_delta.seconds,
+    )
+
+
+@lru_cache(maxsize=HUMANIZE_CACHE_SIZE)
+def _humanize_fields(
+    locale: str,
+    years: int,
+    months: int,
+    days: int,
+    hours: int,
+    minutes: int,
+    seconds: int,
+) -> str:
+    """Humanize the (normalized) fields of a relativedelta."""
+    periods = [
+        ("year", "years", years),
+        ("month", "months", months),
+        ("week", "weeks", int(days / 7)),
+        ("day", "days", days % 7),
+        ("hour", "hours", hours),
+        ("minute", "minutes", minutes),
+        ("second", "seconds", seconds),
+    ]
+
+    strings = []
+    for period_name, plural_period_name, time_unit in periods:
+        if time_unit == 0:
+            continue
+        unit = plural_period_name if time_unit not in (1, -1) else period_name
+        strings.append(f"{time_unit} {unit}")
+
+    if not strings:
+        strings.append("0 seconds")
+    return humanize_list(strings, locale=locale)
+
 
 class CompositeMetaClass(type(commands.Cog), type(ABC)):
     """Allows the metaclass used for proper type detection to coexist with discord.py's metaclass."""
@@ -36,10 +104,14 @@ class RemindMe(
     __author__ = "PhasecoreX"
     __version__ = "3.1.0"
 
-    default_global_settings: ClassVar[dict[str, int]] = {
+    default_global_settings: ClassVar[dict[str, int | None]] = {
         "schema_version": 0,
         "total_sent": 0,
         "max_user_reminders": 20,
+        "send_workers": 5,
+        "show_missed_repeats": True,
+        "sharded_scheduling": False,
+        "reminder_bucket_floor": None,
     }
     default_guild_settings: ClassVar[dict[str, bool]] = {
         "me_too": False,
@@ -54,7 +126,21 @@ class RemindMe(
         "repeat": {},  # relativedelta dict
     }
     SEND_DELAY_SECONDS = 30
+    DM_CHANNEL_CACHE_SIZE = 1000
+    DM_CHANNEL_WARMUP_SECONDS = 60
+    RETRY_DELAY_SECONDS = 15
+    MAX_RETRY_DELAY_SECONDS = 900
+    MAX_RETRY_QUEUE_SIZE = 10000
+    MAX_SLEEP_SECONDS = 3600
+    BUCKET_SECONDS = 3600
+    BUCKET_PRELOAD_SECONDS = 600
+    LOAD_CHUNK_SIZE = 1000
+    SHARD_RESCAN_SECONDS = 60
+    SHARD_LEASE_SECONDS = 300
+    ME_TOO_TIMEOUT_SECONDS = 30
     MAX_REMINDER_LENGTH = 800
+    MAX_SEND_WORKERS = 20
+    IMPORT_EXPORT_CHUNK_SIZE = 500
 
     def __init__(self, bot: Red) -> None:
         """Set up the cog."""
@@ -68,25 +154,79 @@ class RemindMe(
         # user id -> user reminder id
         self.config.init_custom("REMINDER", 2)
         self.config.register_custom("REMINDER", **self.default_reminder_settings)
+        # expires // BUCKET_SECONDS -> "<user id>-<user reminder id>" -> expires
+        self.config.init_custom("REMINDER_BUCKET", 1)
         self.bg_loop_task = None
         self.background_tasks = set()
-        self.next_reminder_to_send = {}
-        self.search_for_next_reminder = True
-        self.me_too_reminders = {}
-        self.clicked_me_too_reminder = {}
+        self.scheduler = ReminderScheduler()
+        self.reminder_index = UserReminderIndex(lazy=True)
+        # The scheduler has every reminder in buckets before this one
+        self.loaded_buckets_until = 0
+        # Every bucket before this one is empty
+        self.bucket_floor: int | None = None
+        self.saved_bucket_floor: int | None = None
+        # Held while changing the REMINDER_BUCKET expiry index or the floor
+        self.bucket_lock = asyncio.Lock()
+        # Whether every overdue bucket has been loaded since the last load_schedule
+        self.schedule_loaded = False
+        # Users with reminders due soon, that should be added to the reminder index
+        self.users_to_index: set[int] = set()
+        self.index_warmer_task = None
+        # user id -> DM channel, for users that have recently gotten (or will soon get) a reminder
+        self.dm_channels = LRUCache(self.DM_CHANNEL_CACHE_SIZE)
+        # user id -> DM channel being opened, so that it is only opened once
+        self.dm_channel_opens: dict[int, asyncio.Task] = {}
+        # DM channels have been opened for reminders that are due before this time
+        self.dm_channels_warm_until = 0.0
+        # Users with reminders due soon, that should have their DM channel opened
+        self.users_to_open_dm_channel: set[int] = set()
+        self.dm_channel_warmer_task = None
+        # (user id, user reminder id, old expires, new expires)
+        self.pending_bucket_moves: list[tuple[int, int, int | None, int | None]] = []
+        self.bg_loop_wakeup = asyncio.Event()
+        # "me too" message id -> {"message", "reminder", "clicked"}
+        self.me_too_prompts = ExpiringRegistry()
+        self.me_too_sweeper_task = None
+        self.me_too_sweeper_wakeup = asyncio.Event()
         self.reminder_emoji = "\N{BELL}"
         self.reminder_parser = ReminderParser()
-        self.problematic_reminders = []
+        self.retry_queue = RetryQueue(
+            self.RETRY_DELAY_SECONDS,
+            self.MAX_RETRY_DELAY_SECONDS,
+            self.MAX_RETRY_QUEUE_SIZE,
+        )
         self.sent_retry_warning = False
+        # (user id, user reminder id) -> (expires it was sent for, changed fields or None for deletion)
+        self.pending_reminder_writes: dict[
+            tuple[int, int], tuple[int, dict[str, Any] | None]
+        ] = {}
+        self.unsaved_total_sent = 0
+        self.sharded_mode = False
+        self.lease_store: ReminderLeaseStore | None = None
+        self.next_shard_rescan = 0.0
+        self.metrics = ReminderMetrics()
+        self.metrics_exporters: list[Callable[[dict[str, Any]], Awaitable[None]]] = []
 
     #
     # Red methods
     #
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
         """Clean up when cog shuts down."""
         if self.bg_loop_task:
             self.bg_loop_task.cancel()
+        if self.me_too_sweeper_task:
+            self.me_too_sweeper_task.cancel()
+        if self.index_warmer_task:
+            self.index_warmer_task.cancel()
+        if self.dm_channel_warmer_task:
+            self.dm_channel_warmer_task.cancel()
+        await asyncio.gather(
+            *(delete(prompt["message"]) for prompt in self.me_too_prompts.pop_all())
+        )
+        await self._save_pending_writes()
+        if self.lease_store:
+            self.lease_store.close()
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
@@ -95,7 +235,9 @@ class RemindMe(
 
     async def red_delete_data_for_user(self, *, _requester: str, user_id: int) -> None:
         """There's already a [p]forgetme command, so..."""
+        await self.load_user_index(user_id)
         await self.config.custom("REMINDER", str(user_id)).clear()
+        await self.update_bg_task(user_id)
 
     #
     # Initialization methods
@@ -104,6 +246,7 @@ class RemindMe(
     async def initialize(self) -> None:
         """Perform setup actions before loading cog."""
         await self._migrate_config()
+        await self.load_schedule()
         self._enable_bg_loop()
 
     async def _migrate_config(self) -> None:
@@ -189,6 +332,11 @@ class RemindMe(
             await self.config.clear_raw("reminders")
             await self.config.schema_version.set(2)
 
+        if schema_version < 3:  # noqa: PLR2004
+            # Build the REMINDER_BUCKET expiry index
+            await self.rebuild_bucket_index()
+            await self.config.schema_version.set(3)
+
     #
     # Listener methods
     #
@@ -200,6 +348,9 @@ class RemindMe(
         """Watches for bell reactions on reminder messages."""
         if str(payload.emoji) != self.reminder_emoji:
             return
+        prompt = self.me_too_prompts.get(payload.message_id)
+        if not prompt:
+            return
         if not payload.guild_id or await self.bot.cog_disabled_in_guild_raw(
             self.qualified_name, payload.guild_id
         ):
@@ -215,41 +366,43 @@ class RemindMe(
         if member.bot:
             return
 
-        try:
-            reminder = self.me_too_reminders[payload.message_id]
-            clicked_set = self.clicked_me_too_reminder[payload.message_id]
-            if member.id in clicked_set:
-                return  # User clicked the bell again, not going to add a duplicate reminder
-            clicked_set.add(member.id)
-            if await self.insert_reminder(member.id, reminder):
-                expires_delta = relativedelta(
-                    datetime.datetime.fromtimestamp(reminder["expires"], datetime.UTC),
-                    datetime.datetime.fromtimestamp(reminder["created"], datetime.UTC),
-                )
-                repeat_delta = None
-                if reminder.get("repeat"):
-                    repeat_delta = relativedelta(reminder["repeat"])
-                message = "Hello! I will also send you "
-                if repeat_delta:
-                    message += f"those repeating reminders every {self.humanize_relativedelta(repeat_delta)}"
-                else:
-                    message += f"that reminder in {self.humanize_relativedelta(expires_delta)} (<t:{reminder['expires']}:f>)"
-                if repeat_delta and expires_delta != repeat_delta:
-                    message += f", with the first reminder in {self.humanize_relativedelta(expires_delta)} (<t:{reminder['expires']}:f>)."
-                else:
-                    message += "."
-                await member.send(message)
+        reminder = prompt["reminder"]
+        clicked_set = prompt["clicked"]
+        if member.id in clicked_set:
+            return  # User clicked the bell again, not going to add a duplicate reminder
+        clicked_set.add(member.id)
+        if await self.insert_reminder(member.id, reminder):
+            expires_delta = relativedelta(
+                datetime.datetime.fromtimestamp(reminder["expires"], datetime.UTC),
+                datetime.datetime.fromtimestamp(reminder["created"], datetime.UTC),
+            )
+            repeat_delta = None
+            if reminder.get("repeat"):
+                repeat_delta = relativedelta(reminder["repeat"])
+            message = "Hello! I will also send you "
+            if repeat_delta:
+                message += f"those repeating reminders every {self.humanize_relativedelta(repeat_delta)}"
             else:
-                await self.send_too_many_message(member)
-        except KeyError:
-            return
+                message += f"that reminder in {self.humanize_relativedelta(expires_delta)} (<t:{reminder['expires']}:f>)"
+            if repeat_delta and expires_delta != repeat_delta:
+                message += f", with the first reminder in {self.humanize_relativedelta(expires_delta)} (<t:{reminder['expires']}:f>)."
+            else:
+                message += "."
+            await member.send(message)
+        else:
+            await self.send_too_many_message(member)
 
     #
     # Background loop methods
     #
 
-    def _enable_bg_loop(self) -> None:
-        """Set up the background loop task."""
+    def _start_background_task(
+        self,
+        coro: Coroutine[Any, Any, None],
+        name: str,
+        on_error: Callable[[], None] | None = None,
+    ) -> asyncio.Task:
+        """Start a background task that logs any unexpected exception it dies with."""
 
         def error_handler(fut: asyncio.Future) -> None:
             try:
@@ -258,188 +411,643 @@ class RemindMe(
                 pass
             except Exception as exc:
                 log.exception(
-                    "Unexpected exception occurred in background loop of RemindMe: ",
+                    "Unexpected exception occurred in %s of RemindMe: ",
+                    name,
                     exc_info=exc,
                 )
-                task = asyncio.create_task(
-                    self.bot.send_to_owners(
-                        "An unexpected exception occurred in the background loop of RemindMe.\n"
-                        "Reminders will not be sent out until the cog is reloaded.\n"
-                        "Check your console or logs for details, and consider opening a bug report for this."
-                    )
+                if on_error:
+                    on_error()
+
+        task = self.bot.loop.create_task(coro)
+        task.add_done_callback(error_handler)
+        return task
+
+    def _enable_bg_loop(self) -> None:
+        """Set up the background loop task."""
+
+        def notify_owners() -> None:
+            task = asyncio.create_task(
+                self.bot.send_to_owners(
+                    "An unexpected exception occurred in the background loop of RemindMe.\n"
+                    "Reminders will not be sent out until the cog is reloaded.\n"
+                    "Check your console or logs for details, and consider opening a bug report for this."
                 )
-                self.background_tasks.add(task)
-                task.add_done_callback(self.background_tasks.discard)
+            )
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
 
-        self.bg_loop_task = self.bot.loop.create_task(self._bg_loop())
-        self.bg_loop_task.add_done_callback(error_handler)
+        self.bg_loop_task = self._start_background_task(
+            self._bg_loop(), "background loop", notify_owners
+        )
 
     async def _bg_loop(self) -> None:
         """Background loop."""
         await self.bot.wait_until_ready()
-        self.search_for_next_reminder = True
         while True:
-            current_time_seconds = int(datetime.datetime.now(datetime.UTC).timestamp())
-            # Check if we need to send the current reminder
+            # Anything that changes the schedule from here on will wake us back up
+            self.bg_loop_wakeup.clear()
+            current_time = datetime.datetime.now(datetime.UTC).timestamp()
+
+            # Other processes don't tell us about new reminders, so we need to check for them
+            if self.sharded_mode and current_time >= self.next_shard_rescan:
+                await self.load_schedule()
+            # Load reminders that will be due soon, a chunk at a time so that the
+            # earliest ones are sent without waiting for the rest of them to load
+            buckets_loaded = True
             if (
-                not self.next_reminder_to_send
-                or current_time_seconds < self.next_reminder_to_send["expires"]
+                current_time + self.BUCKET_PRELOAD_SECONDS
+                >= self.loaded_buckets_until * self.BUCKET_SECONDS
             ):
-                await asyncio.sleep(1)
-            else:
-                await self._send_reminder(self.next_reminder_to_send)
-                self.search_for_next_reminder = True
+                buckets_loaded = await self._load_buckets(
+                    current_time, self.LOAD_CHUNK_SIZE
+                )
 
-            # Check if we need to retry a failed reminder
-            if self.problematic_reminders and not current_time_seconds % 15:
-                retry_reminder = self.problematic_reminders.pop(0)
-                log.debug(
-                    "Retrying user=%d, id=%d...",
-                    retry_reminder["user_id"],
-                    retry_reminder["user_reminder_id"],
+            # Check if we need to send any reminders (or retry any failed ones)
+            due_reminders: dict[tuple[int, int], int | None] = {
+                (user_id, user_reminder_id): expires
+                for expires, user_id, user_reminder_id in self.scheduler.pop_due_with_expires(
+                    current_time
+                )
+            }
+            for reminder_key in self.retry_queue.pop_due(current_time):
+                due_reminders.setdefault(reminder_key, None)
+            if due_reminders:
+                await self._send_due_reminders(due_reminders, current_time)
+                await self._notify_retry_status()
+                await self._export_metrics()
+                continue
+            if not buckets_loaded:
+                continue
+
+            # Open DM channels for reminders that are about to be due ahead of time
+            next_reminder = self.scheduler.peek()
+            dm_channel_warmup_time = None
+            if next_reminder and next_reminder[0] > self.dm_channels_warm_until:
+                dm_channel_warmup_time = (
+                    next_reminder[0] - self.DM_CHANNEL_WARMUP_SECONDS
                 )
-                await self._send_reminder(retry_reminder)
-
-            # Find a new reminder
-            if self.search_for_next_reminder:
-                log.debug("Looking for next reminder...")
-                self.next_reminder_to_send = {}
-                self.search_for_next_reminder = False
-                all_reminders = await self.config.custom(
-                    "REMINDER"
-                ).all()  # Does NOT return default values
-                existing_problematic_reminders = []
-                for user_id, users_reminders in all_reminders.items():
-                    for user_reminder_id, partial_reminder in users_reminders.items():
-                        # If the reminder is expiring sooner than the one we have on deck to send...
-                        if (
-                            not self.next_reminder_to_send
-                            or partial_reminder["expires"]
-                            < self.next_reminder_to_send["expires"]
-                        ):
-                            full_reminder = self._get_full_reminder_from_partial(
-                                int(user_id),
-                                int(user_reminder_id),
-                                partial_reminder,
-                            )
-                            if full_reminder not in self.problematic_reminders:
-                                self.next_reminder_to_send = full_reminder.copy()
-                            else:
-                                existing_problematic_reminders.append(
-                                    full_reminder.copy()
-                                )
-
-                # Update retry list
-                self.problematic_reminders = existing_problematic_reminders
-                # Notify owners that there is a reminder that failed to send and is now retrying
-                if self.problematic_reminders and not self.sent_retry_warning:
-                    self.sent_retry_warning = True
-                    await self.bot.send_to_owners(
-                        "I am running into an issue sending out reminders currently.\n"
-                        "I will keep retrying every so often until it can be sent, in case this is just a network issue.\n"
-                        "Check your console or logs for details, and consider opening a bug report for this if it isn't a network issue."
+                if dm_channel_warmup_time <= current_time:
+                    self.dm_channels_warm_until = (
+                        current_time + self.DM_CHANNEL_WARMUP_SECONDS
                     )
-                elif self.sent_retry_warning and not self.problematic_reminders:
-                    self.sent_retry_warning = False
-                    await self.bot.send_to_owners(
-                        "Seems like I was able to send all of the backlogged reminders!"
+                    self.users_to_open_dm_channel.update(
+                        user_id
+                        for _, user_id, _ in self.scheduler.due_before(
+                            self.dm_channels_warm_until
+                        )
                     )
+                    self._enable_dm_channel_warmer()
+                    dm_channel_warmup_time = None
 
-                if self.next_reminder_to_send:
-                    log.debug(
-                        "Next reminder is for user=%d, id=%d. It will be sent in %s.",
-                        self.next_reminder_to_send["user_id"],
-                        self.next_reminder_to_send["user_reminder_id"],
-                        self.humanize_relativedelta(
-                            relativedelta(
-                                datetime.datetime.fromtimestamp(
-                                    self.next_reminder_to_send["expires"],
-                                    datetime.UTC,
-                                ),
-                                datetime.datetime.now(datetime.UTC),
-                            )
-                        ),
-                    )
-                else:
-                    log.debug("There are no more reminders left to send.")
+            # Sleep until the next reminder or retry is due, or until the schedule changes
+            wake_times = [
+                wake_time
+                for wake_time in (
+                    next_reminder[0] if next_reminder else None,
+                    dm_channel_warmup_time,
+                    self.retry_queue.next_retry_time(),
+                    self.next_shard_rescan if self.sharded_mode else None,
+                    self.loaded_buckets_until * self.BUCKET_SECONDS
+                    - self.BUCKET_PRELOAD_SECONDS,
+                )
+                if wake_time is not None
+            ]
+            # Still wake up every so often, in case the system clock changes
+            timeout = self.MAX_SLEEP_SECONDS
+            if wake_times:
+                timeout = min(timeout, min(wake_times) - current_time)
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.bg_loop_wakeup.wait(), timeout=timeout)
+
+    async def _notify_retry_status(self) -> None:
+        """Notify owners when reminders start (or stop) failing to send."""
+        if self.retry_queue and not self.sent_retry_warning:
+            self.sent_retry_warning = True
+            await self.bot.send_to_owners(
+                "I am running into an issue sending out reminders currently.\n"
+                "I will keep retrying every so often until it can be sent, in case this is just a network issue.\n"
+                "Check your console or logs for details, and consider opening a bug report for this if it isn't a network issue."
+            )
+        elif self.sent_retry_warning and not self.retry_queue:
+            self.sent_retry_warning = False
+            await self.bot.send_to_owners(
+                "Seems like I was able to send all of the backlogged reminders!"
+            )
+
+    async def _export_metrics(self) -> None:
+        """Pass the current metrics to every registered exporter."""
+        if not self.metrics_exporters:
+            return
+        metrics = self.metrics_snapshot()
+        for exporter in self.metrics_exporters:
+            try:
+                await exporter(metrics)
+            except Exception:
+                log.exception("RemindMe metrics exporter %r failed", exporter)
+
+    def _enable_me_too_sweeper(self) -> None:
+        """Set up the "me too" sweeper task, if it isn't already running."""
+        if self.me_too_sweeper_task and not self.me_too_sweeper_task.done():
+            return
+
+        self.me_too_sweeper_task = self._start_background_task(
+            self._me_too_sweeper(), '"me too" sweeper'
+        )
+
+    async def _me_too_sweeper(self) -> None:
+        """Delete "me too" messages once they expire."""
+        while True:
+            self.me_too_sweeper_wakeup.clear()
+            expired_prompts = self.me_too_prompts.pop_expired(self.bot.loop.time())
+            if expired_prompts:
+                await asyncio.gather(
+                    *(delete(prompt["message"]) for prompt in expired_prompts)
+                )
+                continue
+
+            # Sleep until the next prompt expires, or until a new prompt is added
+            next_expiry = self.me_too_prompts.next_expiry()
+            timeout = (
+                next_expiry - self.bot.loop.time() if next_expiry is not None else None
+            )
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.me_too_sweeper_wakeup.wait(), timeout=timeout
+                )
+
+    def _enable_index_warmer(self) -> None:
+        """Set up the reminder index warmer task, if it isn't already running."""
+        if self.index_warmer_task and not self.index_warmer_task.done():
+            return
+
+        self.index_warmer_task = self._start_background_task(
+            self._index_warmer(), "reminder index warmer"
+        )
+
+    async def _index_warmer(self) -> None:
+        """Add users with reminders due soon to the reminder index, a chunk at a time.
+
+        This way their bucket entries can be moved right away when they change their reminders,
+        and commands don't need to read them from the config first.
+        """
+        while self.users_to_index:
+            user_ids = [
+                self.users_to_index.pop()
+                for _ in range(min(len(self.users_to_index), self.LOAD_CHUNK_SIZE))
+            ]
+            for user_id in user_ids:
+                await self.load_user_index(user_id)
+            # Give everything else a chance to run between chunks
+            await asyncio.sleep(0)
+
+    def _enable_dm_channel_warmer(self) -> None:
+        """Set up the DM channel warmer task, if it isn't already running."""
+        if self.dm_channel_warmer_task and not self.dm_channel_warmer_task.done():
+            return
+
+        self.dm_channel_warmer_task = self._start_background_task(
+            self._dm_channel_warmer(), "DM channel warmer"
+        )
+
+    async def _dm_channel_warmer(self) -> None:
+        """Open DM channels for users with reminders that are about to be due, so that sending them is quicker.
+
+        Sending a DM to a user whose DM channel isn't known first needs an extra request
+        to open one, which adds up when a lot of reminders are due at the same time.
+        """
+        while self.users_to_open_dm_channel:
+            user = self.bot.get_user(self.users_to_open_dm_channel.pop())
+            if user is None:
+                continue
+            with suppress(discord.HTTPException):
+                await self._get_dm_channel(user)
 
     #
     # Private methods
     #
 
-    async def _send_reminder(self, full_reminder: dict) -> None:
-        """Send reminders that have expired."""
+    async def _load_buckets(
+        self, current_time: float, max_reminders: int | None = None
+    ) -> bool:
+        """Schedule the reminders from every bucket that is overdue or will be due soon, earliest first.
+
+        Stops early once at least max_reminders reminders have been read, so that those can be
+        sent before the rest are loaded. Returns True if every bucket was loaded.
+        """
+        load_until = (
+            int((current_time + self.BUCKET_PRELOAD_SECONDS) // self.BUCKET_SECONDS) + 1
+        )
+        loaded_reminders = 0
+        while self.loaded_buckets_until < load_until:
+            if max_reminders is not None and loaded_reminders >= max_reminders:
+                return False
+            bucket = self.loaded_buckets_until
+            async with self.bucket_lock:
+                bucket_entries = await self.config.custom(
+                    "REMINDER_BUCKET", str(bucket)
+                ).all()
+                if not bucket_entries and bucket == self.bucket_floor:
+                    # Skip past this bucket next time
+                    self.bucket_floor = bucket + 1
+            for reminder_key, expires in bucket_entries.items():
+                user_id, user_reminder_id = map(int, reminder_key.split("-"))
+                if (
+                    self.owns_user(user_id)
+                    and (user_id, user_reminder_id) not in self.retry_queue
+                ):
+                    self.scheduler.schedule(user_id, user_reminder_id, expires)
+                    # The index is thrown away on every rescan when sharded, so don't bother
+                    if not self.sharded_mode:
+                        self.users_to_index.add(user_id)
+            loaded_reminders += len(bucket_entries)
+            self.loaded_buckets_until = bucket + 1
+        async with self.bucket_lock:
+            await self._save_bucket_floor()
+
+        if not self.schedule_loaded:
+            self.schedule_loaded = True
+            log.debug("Loaded %d scheduled reminders", len(self.scheduler))
+        if self.users_to_index:
+            self._enable_index_warmer()
+        return True
+
+    def _schedule(self, user_id: int, user_reminder_id: int, expires: int) -> None:
+        """Schedule a reminder, if its bucket has been loaded (otherwise it will be scheduled when it is)."""
+        if expires // self.BUCKET_SECONDS < self.loaded_buckets_until:
+            self.scheduler.schedule(user_id, user_reminder_id, expires)
+        else:
+            self.scheduler.unschedule(user_id, user_reminder_id)
+
+    async def _move_bucket_entry(
+        self,
+        user_id: int,
+        user_reminder_id: int,
+        old_expires: int | None,
+        new_expires: int | None,
+    ) -> None:
+        """Move a reminder to a different bucket in the REMINDER_BUCKET expiry index.
+
+        old_expires is None for new reminders, and new_expires is None for deleted reminders.
+        """
+        bucket_entry = f"{user_id}-{user_reminder_id}"
+        new_bucket = (
+            new_expires // self.BUCKET_SECONDS if new_expires is not None else None
+        )
+        async with self.bucket_lock:
+            if (
+                old_expires is not None
+                and old_expires // self.BUCKET_SECONDS != new_bucket
+            ):
+                old_bucket_number = old_expires // self.BUCKET_SECONDS
+                old_bucket = self.config.custom(
+                    "REMINDER_BUCKET", str(old_bucket_number)
+                )
+                # Unless a new reminder with the same ID was put there in the meantime
+                if await old_bucket.get_raw(bucket_entry, default=None) == old_expires:
+                    await old_bucket.clear_raw(bucket_entry)
+                    if not await old_bucket.all():
+                        await old_bucket.clear()
+                        if old_bucket_number == self.bucket_floor:
+                            await self._advance_bucket_floor()
+            if new_bucket is not None:
+                await self.config.custom("REMINDER_BUCKET", str(new_bucket)).set_raw(
+                    bucket_entry, value=new_expires
+                )
+                if self.bucket_floor is None or new_bucket < self.bucket_floor:
+                    self.bucket_floor = new_bucket
+            await self._save_bucket_floor()
+
+    async def _advance_bucket_floor(self) -> None:
+        """Move the floor past empty buckets, up to the first bucket that hasn't been loaded yet.
+
+        Buckets that haven't been loaded yet are skipped past as they are loaded instead.
+        Must be called with bucket_lock held.
+        """
+        floor = self.bucket_floor
+        if floor is None:
+            return
+        while (
+            floor < self.loaded_buckets_until
+            and not await self.config.custom("REMINDER_BUCKET", str(floor)).all()
+        ):
+            floor += 1
+        self.bucket_floor = floor
+
+    async def _save_bucket_floor(self) -> None:
+        """Save the floor to the config, if it has changed. Must be called with bucket_lock held."""
+        if self.bucket_floor != self.saved_bucket_floor:
+            await self.config.reminder_bucket_floor.set(self.bucket_floor)
+            self.saved_bucket_floor = self.bucket_floor
+
+    async def rebuild_bucket_index(self) -> int:
+        """Rebuild the REMINDER_BUCKET expiry index from the reminders themselves.
+
+        Returns how many index entries were added or removed (moving one counts as both).
+        """
+        async with self.bucket_lock:
+            # Nothing can move bucket entries while we hold the lock, so reminders that are
+            # added after this read will be put in the new index once we are done
+            all_reminders = await self.config.custom(
+                "REMINDER"
+            ).all()  # Does NOT return default values
+            old_buckets = await self.config.custom("REMINDER_BUCKET").all()
+            buckets = {}
+            for user_id, users_reminders in all_reminders.items():
+                for user_reminder_id, partial_reminder in users_reminders.items():
+                    buckets.setdefault(
+                        str(partial_reminder["expires"] // self.BUCKET_SECONDS), {}
+                    )[f"{user_id}-{user_reminder_id}"] = partial_reminder["expires"]
+            await self.config.custom("REMINDER_BUCKET").set(buckets)
+            self.bucket_floor = min((int(bucket) for bucket in buckets), default=None)
+            await self._save_bucket_floor()
+        old_entries = {
+            (bucket, *bucket_entry)
+            for bucket, bucket_entries in old_buckets.items()
+            for bucket_entry in bucket_entries.items()
+        }
+        new_entries = {
+            (bucket, *bucket_entry)
+            for bucket, bucket_entries in buckets.items()
+            for bucket_entry in bucket_entries.items()
+        }
+        return len(old_entries ^ new_entries)
+
+    async def _send_due_reminders(
+        self,
+        reminder_keys: dict[tuple[int, int], int | None],
+        current_time: float,
+    ) -> None:
+        """Send a batch of due reminders using a limited number of concurrent workers.
+
+        reminder_keys maps each reminder to the expiry time it was scheduled for (if known).
+        discord.py handles the actual rate limits for us, the worker limit just keeps us
+        from flooding its queue (and the config) when there is a large backlog.
+        """
+        if len(reminder_keys) > 1:
+            log.debug("Sending %d due reminders...", len(reminder_keys))
+        self.metrics.batches += 1
+        pending_keys = iter(reminder_keys.items())
+
+        async def worker() -> None:
+            for (user_id, user_reminder_id), scheduled_expires in pending_keys:
+                full_reminder = await self._get_full_reminder(user_id, user_reminder_id)
+                if scheduled_expires is not None and scheduled_expires != (
+                    full_reminder["expires"] if full_reminder else None
+                ):
+                    # The expiry bucket index is out of date, fix it up
+                    self.pending_bucket_moves.append(
+                        (
+                            user_id,
+                            user_reminder_id,
+                            scheduled_expires,
+                            full_reminder["expires"] if full_reminder else None,
+                        )
+                    )
+                if not full_reminder:
+                    # Reminder was deleted without notifying us
+                    self.metrics.stale += 1
+                    self.retry_queue.discard(user_id, user_reminder_id)
+                    self.reminder_index.remove(user_id, user_reminder_id)
+                elif full_reminder["expires"] > current_time:
+                    # Reminder was modified without notifying us, try again later
+                    self.metrics.stale += 1
+                    self.retry_queue.discard(user_id, user_reminder_id)
+                    self._schedule(user_id, user_reminder_id, full_reminder["expires"])
+                elif not self.lease_store or not self.sharded_mode:
+                    await self._send_reminder(full_reminder)
+                else:
+                    await self._send_leased_reminder(full_reminder)
+
+        worker_count = min(len(reminder_keys), max(1, await self.config.send_workers()))
+        try:
+            # If a worker fails, the rest are cancelled before the pending writes are saved
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(worker_count):
+                    task_group.create_task(worker())
+        finally:
+            await self._save_pending_writes()
+
+    async def _send_leased_reminder(self, full_reminder: dict) -> None:
+        """Send a reminder, but only if no other process has (or is currently) sending it."""
+        lease_key = (
+            full_reminder["user_id"],
+            full_reminder["user_reminder_id"],
+            full_reminder["expires"],
+        )
+        if not await asyncio.to_thread(
+            self.lease_store.claim,
+            *lease_key,
+            datetime.datetime.now(datetime.UTC).timestamp(),
+            self.SHARD_LEASE_SECONDS,
+        ):
+            log.debug(
+                "Reminder for user=%d, id=%d is being sent by another process",
+                full_reminder["user_id"],
+                full_reminder["user_reminder_id"],
+            )
+            # The other process takes care of retrying it too
+            self.retry_queue.discard(
+                full_reminder["user_id"], full_reminder["user_reminder_id"]
+            )
+            return
+        if await self._send_reminder(full_reminder):
+            await asyncio.to_thread(self.lease_store.complete, *lease_key)
+        else:
+            await asyncio.to_thread(self.lease_store.release, *lease_key)
+
+    async def _save_pending_writes(self) -> None:
+        """Save the reminder changes and counters that _send_reminder has queued up.
+
+        Each reminder gets a single write no matter how many of its fields changed,
+        and total_sent gets a single write for the whole batch.
+        """
+        pending_bucket_moves, self.pending_bucket_moves = self.pending_bucket_moves, []
+        for bucket_move in pending_bucket_moves:
+            await self._move_bucket_entry(*bucket_move)
+        pending_writes, self.pending_reminder_writes = self.pending_reminder_writes, {}
+        for (user_id, user_reminder_id), (
+            sent_expires,
+            changes,
+        ) in pending_writes.items():
+            config_user = self.config.custom("REMINDER", str(user_id))
+            partial_reminder = await config_user.get_raw(
+                str(user_reminder_id), default=None
+            )
+            if partial_reminder is None or partial_reminder["expires"] != sent_expires:
+                # User deleted or modified it (or made a new one with the same ID) while we were sending it
+                continue
+            if changes is None:
+                await config_user.clear_raw(str(user_reminder_id))
+                continue
+            partial_reminder.update(changes)
+            await config_user.set_raw(str(user_reminder_id), value=partial_reminder)
+
+        if self.unsaved_total_sent:
+            unsaved_total_sent, self.unsaved_total_sent = self.unsaved_total_sent, 0
+            async with self.config.total_sent.get_lock():
+                total_sent = await self.config.total_sent()
+                await self.config.total_sent.set(total_sent + unsaved_total_sent)
+
+    async def _send_reminder(self, full_reminder: dict) -> bool:
+        """Send reminders that have expired.
+
+        Returns True if the reminder is done with (sent or deleted), or False if it will be retried later.
+        """
         delete = False
+        reminder_key = (full_reminder["user_id"], full_reminder["user_reminder_id"])
+        changes = {}
+        next_reminder_time = None
+        missed_repeats = 0
+
+        # Figure out when repeating reminders are due next
+        if full_reminder["repeat"]:
+            now = datetime.datetime.now(datetime.UTC)
+            try:
+                # Make sure repeat interval is at least a day
+                if now + relativedelta(**full_reminder["repeat"]) < now + relativedelta(
+                    days=1
+                ):
+                    full_reminder["repeat"] = {"days": 1}
+                    changes["repeat"] = full_reminder["repeat"]
+                next_reminder_time, repeats = next_repeat_time(
+                    datetime.datetime.fromtimestamp(
+                        full_reminder["expires"], datetime.UTC
+                    ),
+                    relativedelta(**full_reminder["repeat"]),
+                    now,
+                )
+                # The first repeat is the one we are sending now
+                missed_repeats = max(0, repeats - 1)
+            except (OverflowError, ValueError):
+                # Next repeat would be after the year 9999. We don't support that.
+                pass
+
         user = self.bot.get_user(full_reminder["user_id"])
+        if user is None and self.sharded_mode:
+            # We might not share any guilds with the user on our shards
+            try:
+                user = await self.bot.fetch_user(full_reminder["user_id"])
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as http_exception:
+                self._retry_reminder(full_reminder, http_exception)
+                return False
         if user is None:
             log.debug(
                 "User=%d is not visible to the bot. Deleting reminder.",
                 full_reminder["user_id"],
             )
             delete = True
+            self.metrics.undeliverable += 1
         else:
-            embed = await self._generate_reminder_embed(user, full_reminder)
+            if missed_repeats and not await self.config.show_missed_repeats():
+                missed_repeats = 0
+            embed = await self._generate_reminder_embed(
+                user, full_reminder, missed_repeats
+            )
             try:
                 log.debug("Sending reminder to user=%d...", full_reminder["user_id"])
-                await user.send(embed=embed)
+                dm_channel = await self._get_dm_channel(user)
+                await dm_channel.send(embed=embed)
             except (discord.Forbidden, discord.NotFound):
                 # Can't send DM's to user: delete reminder
+                self.dm_channels.pop(user.id)
                 log.debug(
                     "User=%d doesn't allow DMs. Deleting reminder.",
                     full_reminder["user_id"],
                 )
                 delete = True
+                self.metrics.undeliverable += 1
             except discord.HTTPException as http_exception:
-                # Something weird happened: retry next time
-                log.warning(
-                    "HTTP exception when trying to send reminder for user=%d, id=%d:\n%s",
-                    full_reminder["user_id"],
-                    full_reminder["user_reminder_id"],
-                    str(http_exception),
-                )
-                self.problematic_reminders.append(full_reminder)
-                return
+                self._retry_reminder(full_reminder, http_exception)
+                return False
             else:
-                total_sent = await self.config.total_sent()
-                await self.config.total_sent.set(total_sent + 1)
+                self.unsaved_total_sent += 1
+                self.metrics.sent += 1
+                self.metrics.send_latency.observe(
+                    datetime.datetime.now(datetime.UTC).timestamp()
+                    - full_reminder["expires"]
+                )
 
-        # Get the config for editing
-        config_reminder = self.config.custom(
-            "REMINDER",
-            str(full_reminder["user_id"]),
-            str(full_reminder["user_reminder_id"]),
-        )
+        self.retry_queue.discard(*reminder_key)
 
-        # Handle repeats and deletes
-        if not delete and full_reminder["repeat"]:
-            # Make sure repeat interval is at least a day
-            now = datetime.datetime.now(datetime.UTC)
-            if now + relativedelta(**full_reminder["repeat"]) < now + relativedelta(
-                days=1
-            ):
-                full_reminder["repeat"] = {"days": 1}
-                await config_reminder.repeat.set(full_reminder["repeat"])
-            # Calculate next reminder
-            next_reminder_time = datetime.datetime.fromtimestamp(
-                full_reminder["expires"], datetime.UTC
+        # Handle repeats and deletes (these are saved by _save_pending_writes)
+        if not delete and next_reminder_time:
+            next_reminder_timestamp = int(next_reminder_time.timestamp())
+            changes["created"] = full_reminder["expires"]
+            changes["expires"] = next_reminder_timestamp
+            self.pending_reminder_writes[reminder_key] = (
+                full_reminder["expires"],
+                changes,
             )
-            repeat_time = relativedelta(**full_reminder["repeat"])
-            try:
-                while next_reminder_time < now:
-                    next_reminder_time = next_reminder_time + repeat_time
-                # Set new reminder time
-                await config_reminder.created.set(full_reminder["expires"])
-                await config_reminder.expires.set(int(next_reminder_time.timestamp()))
-            except (OverflowError, ValueError):
-                # Next repeat would be after the year 9999. We don't support that.
-                await config_reminder.clear()
+            self.pending_bucket_moves.append(
+                (*reminder_key, full_reminder["expires"], next_reminder_timestamp)
+            )
+            self._schedule(*reminder_key, next_reminder_timestamp)
+            self.reminder_index.add(*reminder_key, next_reminder_timestamp)
         else:
-            await config_reminder.clear()
-        # Search for next reminder, in case this was a successful retry reminder
-        self.search_for_next_reminder = True
+            self.pending_reminder_writes[reminder_key] = (
+                full_reminder["expires"],
+                None,
+            )
+            self.pending_bucket_moves.append(
+                (*reminder_key, full_reminder["expires"], None)
+            )
+            self.reminder_index.remove(*reminder_key)
+        return True
+
+    async def _get_dm_channel(
+        self, user: discord.User | discord.Member
+    ) -> discord.DMChannel:
+        """Get the DM channel for a user, opening one if it isn't cached."""
+        dm_channel = self.dm_channels.get(user.id) or user.dm_channel
+        if dm_channel is not None:
+            self.dm_channels.put(user.id, dm_channel)
+            return dm_channel
+        dm_channel_open = self.dm_channel_opens.get(user.id)
+        if dm_channel_open is None:
+            dm_channel_open = asyncio.create_task(self._open_dm_channel(user))
+            self.dm_channel_opens[user.id] = dm_channel_open
+        # Don't cancel it for everyone else waiting on it if we get cancelled
+        return await asyncio.shield(dm_channel_open)
+
+    async def _open_dm_channel(
+        self, user: discord.User | discord.Member
+    ) -> discord.DMChannel:
+        """Open a DM channel for a user and cache it."""
+        try:
+            dm_channel = await user.create_dm()
+            self.dm_channels.put(user.id, dm_channel)
+            return dm_channel
+        finally:
+            del self.dm_channel_opens[user.id]
+
+    def _retry_reminder(
+        self, full_reminder: dict, http_exception: discord.HTTPException
+    ) -> None:
+        """Something weird happened when sending a reminder: retry later."""
+        self.metrics.failed += 1
+        log.warning(
+            "HTTP exception when trying to send reminder for user=%d, id=%d:\n%s",
+            full_reminder["user_id"],
+            full_reminder["user_reminder_id"],
+            str(http_exception),
+        )
+        current_time = datetime.datetime.now(datetime.UTC).timestamp()
+        if not self.retry_queue.add(
+            full_reminder["user_id"],
+            full_reminder["user_reminder_id"],
+            current_time,
+        ):
+            # Retry queue is full, just put it back on the schedule for later
+            self.scheduler.schedule(
+                full_reminder["user_id"],
+                full_reminder["user_reminder_id"],
+                int(current_time + self.MAX_RETRY_DELAY_SECONDS),
+            )
 
     async def _generate_reminder_embed(
-        self, user: discord.User, full_reminder: dict
+        self, user: discord.User, full_reminder: dict, missed_repeats: int = 0
     ) -> discord.Embed:
         """Generate the reminder embed."""
         # Determine any delay
@@ -465,8 +1073,11 @@ class RemindMe(
         # Field value - time ago
         if full_reminder["repeat"]:
             field_value = (
-                f"Every {self.humanize_relativedelta(full_reminder['repeat'])}:"
+                f"Every {self.humanize_relativedelta(full_reminder['repeat'])}"
             )
+            if missed_repeats:
+                field_value += f" (this covers {missed_repeats} earlier {'reminder' if missed_repeats == 1 else 'reminders'} I missed)"
+            field_value += ":"
         else:
             time_ago = (
                 self.humanize_relativedelta(
@@ -508,26 +1119,24 @@ class RemindMe(
         embed.add_field(name=field_name, value=field_value)
         return embed
 
-    def _get_full_reminder_from_partial(
-        self,
-        user_id: int,
-        user_reminder_id: int,
-        partial_reminder: dict,
-    ) -> dict[str, Any]:
-        """Construct a full reminder from a partial reminder.
+    async def _get_full_reminder(
+        self, user_id: int, user_reminder_id: int
+    ) -> dict[str, Any] | None:
+        """Load a full reminder from the config, or None if it doesn't exist anymore.
 
-        This reminder object will be the same as the partial_reminder passed in,
-        except that it will include the user_id, the user_reminder_id, as well as
+        This reminder object will include the user_id, the user_reminder_id, as well as
         any missing defaults (such as repeat).
 
         DO NOT SAVE THIS BACK TO THE CONFIG! Doing so would be a waste of disk space.
         Only save back specific modified values (and never user_id nor user_reminder_id).
         """
-        result = self.config.custom(
+        result = await self.config.custom(
             "REMINDER",
             str(user_id),
             str(user_reminder_id),
-        ).nested_update(partial_reminder)
+        ).all()
+        if result["expires"] is None:
+            return None
         result.update(
             {
                 "user_id": user_id,
@@ -542,29 +1151,21 @@ class RemindMe(
 
     @staticmethod
     def humanize_relativedelta(relative_delta: relativedelta | dict) -> str:
-        """Convert relativedelta (or a dict of its keyword arguments) into a humanized string."""
-        if isinstance(relative_delta, dict):
-            relative_delta = relativedelta(**relative_delta)
-        periods = [
-            ("year", "years", relative_delta.years),
-            ("month", "months", relative_delta.months),
-            ("week", "weeks", relative_delta.weeks),
-            ("day", "days", relative_delta.days % 7),
-            ("hour", "hours", relative_delta.hours),
-            ("minute", "minutes", relative_delta.minutes),
-            ("second", "seconds", relative_delta.seconds),
-        ]
-
-        strings = []
-        for period_name, plural_period_name, time_unit in periods:
-            if time_unit == 0:
-                continue
-            unit = plural_period_name if time_unit not in (1, -1) else period_name
-            strings.append(f"{time_unit} {unit}")
+        """Convert relativedelta (or a dict of its keyword arguments) into a humanized string.
 
-        if not strings:
-            strings.append("0 seconds")
-        return humanize_list(strings)
+        Results are cached, as the same few repeat intervals get humanized over and over.
+        """
+        if isinstance(relative_delta, dict):
+            return _humanize_dict(get_locale(), tuple(sorted(relative_delta.items())))
+        return _humanize_fields(
+            get_locale(),
+            relative_delta.years,
+            relative_delta.months,
+            relative_delta.days,
+            relative_delta.hours,
+            relative_delta.minutes,
+            relative_delta.seconds,
+        )
 
     async def insert_reminder(self, user_id: int, reminder: dict) -> bool:
         """Insert a new reminder into the config.
@@ -574,16 +1175,13 @@ class RemindMe(
         """
         # Check that the user has room for another reminder
         maximum = await self.config.max_user_reminders()
-        users_partial_reminders = await self.config.custom(
-            "REMINDER", str(user_id)
-        ).all()  # Does NOT return default values
-        if len(users_partial_reminders) > maximum - 1:
+        await self.load_user_index(user_id)
+        if self.reminder_index.count(user_id) > maximum - 1:
             return False
 
-        # Get next user_reminder_id
-        next_reminder_id = 1
-        while str(next_reminder_id) in users_partial_reminders:  # Keys are strings
-            next_reminder_id += 1
+        # Get next user_reminder_id, and claim it right away so no one else takes it
+        next_reminder_id = self.reminder_index.next_free_id(user_id)
+        self.reminder_index.add(user_id, next_reminder_id, reminder["expires"])
 
         # Save new reminder
         await self.config.custom("REMINDER", str(user_id), str(next_reminder_id)).set(
@@ -630,6 +1228,121 @@ class RemindMe(
         else:
             await ctx_or_user.send(message)
 
+    def add_me_too_prompt(
+        self, message: discord.Message, reminder: dict, author_id: int
+    ) -> None:
+        """Watch a "me too" message for bell reactions, and delete it once it expires."""
+        self.me_too_prompts.add(
+            message.id,
+            {"message": message, "reminder": reminder, "clicked": {author_id}},
+            self.bot.loop.time() + self.ME_TOO_TIMEOUT_SECONDS,
+        )
+        self._enable_me_too_sweeper()
+        self.me_too_sweeper_wakeup.set()
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return the current scheduler metrics as a dict.
+
+        This is what gets passed to metrics exporters, and what [p]remindmeset stats displays.
+        """
+        current_time = datetime.datetime.now(datetime.UTC).timestamp()
+        next_reminder = self.scheduler.peek()
+        return {
+            **self.metrics.snapshot(),
+            "scheduled": len(self.scheduler),
+            "next_due": next_reminder[0] if next_reminder else None,
+            "next_due_in": (next_reminder[0] - current_time if next_reminder else None),
+            "retry_queue": len(self.retry_queue),
+            "next_retry_in": (
+                next_retry - current_time
+                if (next_retry := self.retry_queue.next_retry_time()) is not None
+                else None
+            ),
+            "unsaved_changes": len(self.pending_reminder_writes),
+            "me_too_prompts": len(self.me_too_prompts),
+            "sharded": self.sharded_mode,
+        }
+
+    def add_metrics_exporter(
+        self, exporter: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """Register a coroutine function that is given metrics_snapshot() after every batch of sent reminders.
+
+        Other cogs can use this to push RemindMe metrics to a monitoring system.
+        Exceptions raised by the exporter are logged and otherwise ignored.
+        """
+        if exporter not in self.metrics_exporters:
+            self.metrics_exporters.append(exporter)
+
+    def remove_metrics_exporter(
+        self, exporter: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """Unregister a metrics exporter."""
+        with suppress(ValueError):
+            self.metrics_exporters.remove(exporter)
+
+    async def load_schedule(self) -> None:
+        """(Re)load the schedule from the REMINDER_BUCKET expiry index.
+
+        This only resets the schedule, the background loop then loads the overdue buckets
+        a chunk at a time (earliest first), followed by the ones that will be due soon
+        as time goes on. Users are added to the reminder index in the background, or as they are needed.
+        In sharded mode, only reminders for users this process is responsible for are scheduled.
+        """
+        self.sharded_mode = await self.config.sharded_scheduling()
+        if self.sharded_mode and storage_type() == "JSON":
+            # Processes don't see each others changes with the JSON backend
+            log.warning(
+                "Sharded scheduling is enabled, but the bot uses the JSON storage backend. "
+                "Running RemindMe unsharded instead."
+            )
+            self.sharded_mode = False
+        self.metrics.rescans += 1
+        current_time = datetime.datetime.now(datetime.UTC).timestamp()
+        self.scheduler.clear()
+        # Other processes may have changed any users reminders
+        self.reminder_index.load({})
+        self.users_to_index.clear()
+
+        # Overdue reminders could be in any bucket after the floor
+        async with self.bucket_lock:
+            self.saved_bucket_floor = await self.config.reminder_bucket_floor()
+            self.bucket_floor = self.saved_bucket_floor
+            if self.bucket_floor is None:
+                self.bucket_floor = int(current_time // self.BUCKET_SECONDS)
+            self.loaded_buckets_until = self.bucket_floor
+        self.schedule_loaded = False
+        if not self.sharded_mode:
+            return
+
+        self.next_shard_rescan = current_time + self.SHARD_RESCAN_SECONDS
+        if self.lease_store is None:
+            self.lease_store = ReminderLeaseStore(
+                cog_data_path(self) / "leases.sqlite3", uuid.uuid4().hex
+            )
+        # Keep finished leases around long enough that every process has seen the reminder change
+        await asyncio.to_thread(self.lease_store.prune, int(current_time) - 86400)
+
+    async def load_user_index(self, user_id: int) -> None:
+        """Make sure a users reminders are in the reminder index, reading them from the config if needed."""
+        if self.reminder_index.is_loaded(user_id):
+            return
+        users_reminders = await self.config.custom(
+            "REMINDER", str(user_id)
+        ).all()  # Does NOT return default values
+        # Someone else may have loaded (and started changing) them while we were waiting
+        if not self.reminder_index.is_loaded(user_id):
+            self.reminder_index.load_user(user_id, users_reminders)
+
+    def owns_user(self, user_id: int) -> bool:
+        """Check if this process is responsible for sending a users reminders.
+
+        Users are spread across shards the same way Discord spreads guilds across them.
+        """
+        if not self.sharded_mode or self.bot.shard_ids is None:
+            return True
+        return (user_id >> 22) % self.bot.shard_count in self.bot.shard_ids
+
     async def update_bg_task(
         self,
         user_id: int,
@@ -642,44 +1355,48 @@ class RemindMe(
         unless we are doing reminder deletions (and forgetme/red_delete_data_for_user)
         """
         user_id = int(user_id)
-        if user_reminder_id:
-            user_reminder_id = int(user_reminder_id)
-        if self.search_for_next_reminder:
-            # If the bg task is already going to perform a search soon
-            log.debug("Background task will be searching for new reminders soon")
-        elif not self.next_reminder_to_send:
-            # If the bg task isn't waiting on any reminders currently
-            self.search_for_next_reminder = True
-            log.debug("Background task has no reminders, forcing search")
-        elif not user_reminder_id and self.next_reminder_to_send["user_id"] == user_id:
+        if not user_reminder_id:
             # If there isn't a user_reminder_id, the user must have deleted all of their reminders
-            self.search_for_next_reminder = True
+            for old_reminder_id, old_expires in self.reminder_index.user_reminders(
+                user_id
+            ).items():
+                await self._move_bucket_entry(
+                    user_id, old_reminder_id, old_expires, None
+                )
+            self.scheduler.unschedule(user_id)
+            self.retry_queue.discard(user_id)
+            self.reminder_index.remove(user_id)
+            log.debug("Removed all reminders for user=%d from background task", user_id)
+            self.bg_loop_wakeup.set()
+            return
+
+        user_reminder_id = int(user_reminder_id)
+        # A modified reminder is no longer problematic, it will be sent as normal
+        self.retry_queue.discard(user_id, user_reminder_id)
+        # If the user isn't in the index, any old bucket entry is cleaned up once it is due
+        old_expires = self.reminder_index.user_reminders(user_id).get(user_reminder_id)
+        if partial_reminder:
+            await self._move_bucket_entry(
+                user_id, user_reminder_id, old_expires, partial_reminder["expires"]
+            )
+            if self.owns_user(user_id):
+                self._schedule(user_id, user_reminder_id, partial_reminder["expires"])
+                if partial_reminder["expires"] <= self.dm_channels_warm_until:
+                    self.users_to_open_dm_channel.add(user_id)
+                    self._enable_dm_channel_warmer()
+            self.reminder_index.add(
+                user_id, user_reminder_id, partial_reminder["expires"]
+            )
             log.debug(
-                "Background task reminder user deleted all their reminders, forcing search"
+                "Scheduled user=%d, id=%d in background task", user_id, user_reminder_id
             )
-        elif (
-            self.next_reminder_to_send["user_id"] == user_id
-            and self.next_reminder_to_send["user_reminder_id"] == user_reminder_id
-        ):
-            # If the modified reminder is the one the bg task is going to send next
-            self.search_for_next_reminder = True
-            log.debug("Modified background task reminder, forcing search")
-        elif (
-            partial_reminder
-            and self.next_reminder_to_send["expires"] > partial_reminder["expires"]
-        ):
-            # If the new reminder expires sooner than the current next reminder
-            self.search_for_next_reminder = True
+        else:
+            await self._move_bucket_entry(user_id, user_reminder_id, old_expires, None)
+            self.scheduler.unschedule(user_id, user_reminder_id)
+            self.reminder_index.remove(user_id, user_reminder_id)
             log.debug(
-                "New reminder expires before background task reminder, forcing search"
+                "Unscheduled user=%d, id=%d from background task",
+                user_id,
+                user_reminder_id,
             )
-        elif user_reminder_id and self.problematic_reminders:
-            # Check if the new reminder is currently being retried
-            for reminder in self.problematic_reminders:
-                if (
-                    reminder["user_id"] == user_id
-                    and reminder["user_reminder_id"] == user_reminder_id
-                ):
-                    self.search_for_next_reminder = True
-                    log.debug("Modified reminder is in the retry queue, forcing search")
-                    break
+        self.bg_loop_wakeup.set()